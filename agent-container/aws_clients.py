@@ -0,0 +1,79 @@
+"""
+Shared, cached boto3 clients.
+
+Creating a boto3 client resolves credentials, loads the service model and
+builds an endpoint with its own HTTPS connection pool, so doing it per call
+costs milliseconds and throws away warm connections. get_client() builds each
+(service, region) client once, from a single session, under a lock (boto3
+sessions are not thread-safe; the clients they create are), and returns the
+same instance afterwards.
+
+Pool size, retry mode and timeouts come from AWS_CLIENT_* environment
+variables. Module factories such as ``permissions._ssm_client`` delegate here
+and remain the monkeypatch points for tests; clear() drops cached clients.
+
+boto3 is imported on first use so it stays off the cold-start path.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+AWS_REGION_DEFAULT = "us-east-1"
+
+# Connections kept per client; should cover the server's worker threads.
+AWS_CLIENT_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_CLIENT_MAX_POOL_CONNECTIONS", "32"))
+# botocore retry mode ("legacy", "standard" or "adaptive") and total attempts.
+AWS_CLIENT_RETRY_MODE = os.environ.get("AWS_CLIENT_RETRY_MODE", "standard")
+AWS_CLIENT_MAX_ATTEMPTS = int(os.environ.get("AWS_CLIENT_MAX_ATTEMPTS", "3"))
+# Per-call timeouts in seconds.
+AWS_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("AWS_CLIENT_CONNECT_TIMEOUT", "2"))
+AWS_CLIENT_READ_TIMEOUT = float(os.environ.get("AWS_CLIENT_READ_TIMEOUT", "30"))
+
+_clients: Dict[Tuple[str, str], object] = {}
+_lock = threading.Lock()
+_session = None
+_created = 0
+
+
+def _client_config():
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=AWS_CLIENT_MAX_POOL_CONNECTIONS,
+        retries={"mode": AWS_CLIENT_RETRY_MODE, "total_max_attempts": AWS_CLIENT_MAX_ATTEMPTS},
+        connect_timeout=AWS_CLIENT_CONNECT_TIMEOUT,
+        read_timeout=AWS_CLIENT_READ_TIMEOUT,
+    )
+
+
+def get_client(service: str, region: Optional[str] = None):
+    """Return the shared boto3 client for *service* in *region* (default: AWS_REGION)."""
+    global _session, _created
+    key = (service, region or os.environ.get("AWS_REGION", AWS_REGION_DEFAULT))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if _session is None:
+                import boto3
+
+                _session = boto3.session.Session()
+            client = _session.client(key[0], region_name=key[1], config=_client_config())
+            _clients[key] = client
+            _created += 1
+    return client
+
+
+def clear() -> None:
+    """Drop all cached clients (tests, or after credential rotation)."""
+    global _session
+    with _lock:
+        _clients.clear()
+        _session = None
+
+
+def stats() -> dict:
+    with _lock:
+        return {"clients": len(_clients), "created": _created}
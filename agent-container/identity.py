@@ -8,6 +8,7 @@ Requirements: 5.1, 5.2, 5.3, 5.4, 5.5, 5.6, 5.7
 """
 
 import logging
+import threading
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
@@ -21,8 +22,10 @@ REQUIRES_TOKEN_TOOLS = ["shell", "file_write", "code_execution"]
 # Maximum token lifetime in hours (requirement 5.5)
 MAX_TOKEN_TTL_HOURS = 24
 
-# In-memory token store keyed by (tenant_id, resource)
+# In-memory token store keyed by (tenant_id, resource).
+# Guarded by _token_lock because the server handles requests on a thread pool.
 _token_store: Dict[Tuple[str, str], "ApprovalToken"] = {}
+_token_lock = threading.Lock()
 
 
 @dataclass
@@ -62,7 +65,8 @@ def issue_approval_token(
         issued_at=now,
         expires_at=now + timedelta(hours=effective_ttl),
     )
-    _token_store[(tenant_id, resource)] = token
+    with _token_lock:
+        _token_store[(tenant_id, resource)] = token
     logger.info(
         "Approval token issued tenant_id=%s resource=%s ttl_hours=%d expires_at=%s",
         tenant_id,
@@ -85,7 +89,13 @@ def validate_token(tenant_id: str, resource: str) -> bool:
 
     Requirements: 5.2, 5.3, 5.7
     """
-    token: Optional[ApprovalToken] = _token_store.get((tenant_id, resource))
+    now = datetime.now(timezone.utc)
+    with _token_lock:
+        token: Optional[ApprovalToken] = _token_store.get((tenant_id, resource))
+        expired = token is not None and now >= token.expires_at
+        if expired:
+            # Remove the stale token; no auto-renewal (requirement 5.7)
+            del _token_store[(tenant_id, resource)]
 
     if token is None:
         logger.info(
@@ -96,8 +106,7 @@ def validate_token(tenant_id: str, resource: str) -> bool:
         )
         return False
 
-    now = datetime.now(timezone.utc)
-    if now >= token.expires_at:
+    if expired:
         logger.info(
             "Approval token expired — re-authorization required "
             "tenant_id=%s resource=%s expired_at=%s",
@@ -105,8 +114,6 @@ def validate_token(tenant_id: str, resource: str) -> bool:
             resource,
             token.expires_at.isoformat(),
         )
-        # Remove the stale token; no auto-renewal (requirement 5.7)
-        del _token_store[(tenant_id, resource)]
         return False
 
     return True
@@ -114,10 +121,12 @@ def validate_token(tenant_id: str, resource: str) -> bool:
 
 def revoke_token(tenant_id: str, resource: str) -> None:
     """Remove the token for (tenant_id, resource) if it exists."""
-    _token_store.pop((tenant_id, resource), None)
+    with _token_lock:
+        _token_store.pop((tenant_id, resource), None)
     logger.info("Approval token revoked tenant_id=%s resource=%s", tenant_id, resource)
 
 
 def clear_all_tokens() -> None:
     """Clear the entire in-memory token store (useful for testing)."""
-    _token_store.clear()
+    with _token_lock:
+        _token_store.clear()
@@ -5,24 +5,267 @@ openclaw's native memory (Markdown + SQLite) continues to work within the
 container lifecycle.  This module provides the *optional* AgentCore Memory
 integration that persists summaries to AWS so they survive container teardown.
 
+The async functions run their boto3 calls on a bounded thread pool, so they
+never block the event loop and accept a per-call timeout.
+
+Recalled summaries are kept in a per-namespace LRU (TTL plus a total size
+bound in bytes) so /invocations does not pay a retrieve round trip on every
+turn. Each entry is a BM25 index (memory_rank.py): recall ranks the
+summaries against the current message and packs the best into
+MEMORY_TOKEN_BUDGET. Storing a summary adds it to the cached index; clearing
+a tenant's memory invalidates the entry.
+
+With MEMORY_WRITE_BEHIND (the default), session summaries are appended to a
+local durable spool (memory_spool.py) and written by a background flusher,
+so session teardown never waits on AgentCore Memory.
+
+compact_tenant_memory() merges near-duplicate summaries in a namespace
+(MinHash/LSH, memory_dedup.py, imported only by that offline job). MEMORY_BACKEND=local swaps
+AgentCore Memory for an in-process store, for local runs and tests.
+
 Requirements: 6.1, 6.2, 6.3, 6.4, 6.5, 6.6, 6.7
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 import sys
+import threading
 import time
-from typing import Optional
-
-import boto3
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import aws_clients  # noqa: E402
+import metrics  # noqa: E402
+from memory_rank import MemoryIndex  # noqa: E402
+from memory_spool import MEMORY_SPOOL_DRAIN_SECONDS, MEMORY_SPOOL_PATH, SummarySpool  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
 # Memory store ID from environment (requirement 6.1)
 MEMORY_STORE_ID = os.environ.get("MEMORY_STORE_ID", "default")
 
+# boto3 is blocking, so Memory calls run on this bounded pool instead of the
+# caller's event loop. MEMORY_TIMEOUT is the default per-call deadline.
+MEMORY_MAX_WORKERS = int(os.environ.get("MEMORY_MAX_WORKERS", "4"))
+MEMORY_TIMEOUT = float(os.environ.get("MEMORY_TIMEOUT_SECONDS", "5"))
+
+_executor = ThreadPoolExecutor(max_workers=MEMORY_MAX_WORKERS, thread_name_prefix="memory")
+
+T = TypeVar("T")
+
+# Recall on /invocations. Enabled by default only when a memory store is
+# configured; MEMORY_RECALL_TIMEOUT bounds the latency it can add to a turn.
+MEMORY_RECALL_ENABLED = os.environ.get(
+    "MEMORY_RECALL_ENABLED", "1" if "MEMORY_STORE_ID" in os.environ else "0",
+).lower() in ("1", "true", "yes")
+MEMORY_RECALL_TIMEOUT = float(os.environ.get("MEMORY_RECALL_TIMEOUT_SECONDS", "1"))
+
+# Read cache for recalled summaries. A TTL of 0 disables caching.
+MEMORY_CACHE_TTL = float(os.environ.get("MEMORY_CACHE_TTL_SECONDS", "300"))
+MEMORY_CACHE_MAX_BYTES = int(os.environ.get("MEMORY_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+
+_ENTRY_OVERHEAD_BYTES = 128  # rough per-entry bookkeeping cost
+
+# Candidates fetched per retrieve for local ranking, and the estimated token
+# budget of the memory text recall adds to a prompt.
+MEMORY_RETRIEVE_MAX = int(os.environ.get("MEMORY_RETRIEVE_MAX", "50"))
+MEMORY_TOKEN_BUDGET = int(os.environ.get("MEMORY_TOKEN_BUDGET", "1024"))
+
+# "agentcore" (default) or "local" for the in-process LocalMemoryClient.
+MEMORY_BACKEND = os.environ.get("MEMORY_BACKEND", "agentcore")
+
+# Compaction: summaries read per namespace (a namespace that fills the page
+# is reported as truncated and left alone, since retrieve cannot page past
+# it), and the estimated Jaccard similarity at which two summaries count as
+# near-duplicates.
+MEMORY_COMPACTION_MAX_RESULTS = int(os.environ.get("MEMORY_COMPACTION_MAX_RESULTS", "100"))
+MEMORY_DEDUP_THRESHOLD = float(os.environ.get("MEMORY_DEDUP_THRESHOLD", "0.8"))
+# Signatures kept by the last compaction run, next to the spool by default.
+MEMORY_COMPACTION_STATE_PATH = os.environ.get(
+    "MEMORY_COMPACTION_STATE_PATH",
+    os.path.join(os.path.dirname(MEMORY_SPOOL_PATH), "memory-compaction.db"),
+)
+
+# Spool session summaries locally and flush them in the background. Set to 0
+# to write synchronously (bounded by the save timeout) instead.
+MEMORY_WRITE_BEHIND = os.environ.get("MEMORY_WRITE_BEHIND", "1").lower() in ("1", "true", "yes")
+
+
+class _RecallCache:
+    """
+    LRU of recalled memory indexes keyed by namespace, bounded by TTL and bytes.
+
+    Empty results (None) are cached too, so tenants without memory do not
+    trigger a retrieve every turn. Like the permission profile cache, a fill
+    that started before an invalidation (or add) for its namespace is
+    discarded, since it may predate the change.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Optional[MemoryIndex], int]]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, namespace: str) -> Tuple[bool, Optional[MemoryIndex]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(namespace)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(namespace)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                self._remove(namespace)
+            self.misses += 1
+            return False, None
+
+    def put(self, namespace: str, value: Optional[MemoryIndex], generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if self._invalidated_at.get(namespace, 0) > generation:
+                return
+            self._store(namespace, value, time.monotonic() + self.ttl)
+
+    def add(self, namespace: str, summary: str) -> None:
+        """Index a newly stored *summary* into the cached entry, if any."""
+        with self._lock:
+            self._bump(namespace)
+            entry = self._entries.get(namespace)
+            if entry is None:
+                return
+            expires, index, _ = entry
+            if index is None:
+                index = MemoryIndex()
+            index.add(summary)
+            self._store(namespace, index, expires)
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            self._bump(namespace)
+            if namespace in self._entries:
+                self._remove(namespace)
+
+    def _bump(self, namespace: str) -> None:
+        self._generation += 1
+        self._invalidated_at[namespace] = self._generation
+
+    def _store(self, namespace: str, value: Optional[MemoryIndex], expires: float) -> None:
+        size = _ENTRY_OVERHEAD_BYTES + len(namespace) + (value.size_bytes if value is not None else 0)
+        if namespace in self._entries:
+            self._remove(namespace)
+        if size > self.max_bytes:
+            return
+        self._entries[namespace] = (expires, value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, namespace: str) -> None:
+        _, _, size = self._entries.pop(namespace)
+        self._bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_recall_cache = _RecallCache(MEMORY_CACHE_TTL, MEMORY_CACHE_MAX_BYTES)
+# Single-flight: concurrent misses for one namespace share one retrieve.
+_inflight: Dict[str, "Future[Optional[MemoryIndex]]"] = {}
+_inflight_lock = threading.Lock()
+
+metrics.register_callback(
+    "openclaw_memory_cache_hits_total", "Memory recall cache hits.",
+    lambda: _recall_cache.hits, type_name="counter",
+)
+metrics.register_callback(
+    "openclaw_memory_cache_misses_total", "Memory recall cache misses.",
+    lambda: _recall_cache.misses, type_name="counter",
+)
+metrics.register_callback(
+    "openclaw_memory_cache_bytes", "Bytes held by the memory recall cache.",
+    lambda: _recall_cache.stats()["bytes"],
+)
+
+_spool: Optional[SummarySpool] = None
+_spool_lock = threading.Lock()
+
+# Per-namespace signatures of the summaries kept by the last compaction run,
+# so the next run (tools/memory_compact.py is one process per run) only has
+# to hash and place summaries added since. Opened on first compaction.
+_compaction_state: "Optional[memory_dedup.SignatureStore]" = None
+_compaction_lock = threading.Lock()
+
+
+class LocalMemoryClient:
+    """
+    In-process stand-in for the AgentCore Memory client (MEMORY_BACKEND=local).
+
+    Implements the calls this module makes, with the same request and
+    response shapes; retrieve returns the newest *maxResults* memories.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, List[dict]] = {}
+        self._next_id = 0
+
+    def retrieve_memories(self, memoryId: str, namespace: str, maxResults: int = 10) -> dict:
+        with self._lock:
+            memories = self._namespaces.get(namespace, [])[-maxResults:]
+            return {"memories": [dict(m) for m in memories]}
+
+    def store_memory(self, memoryId: str, namespace: str, content: str, metadata: Optional[dict] = None) -> dict:
+        with self._lock:
+            self._next_id += 1
+            record_id = f"mem-{self._next_id}"
+            self._namespaces.setdefault(namespace, []).append(
+                {"memoryRecordId": record_id, "content": content, "metadata": dict(metadata or {})}
+            )
+        return {"memoryRecordId": record_id}
+
+    def delete_memory_record(self, memoryId: str, namespace: str, memoryRecordId: str) -> dict:
+        with self._lock:
+            memories = self._namespaces.get(namespace, [])
+            memories[:] = [m for m in memories if m["memoryRecordId"] != memoryRecordId]
+        return {}
+
+    def delete_memories(self, memoryId: str, namespace: str) -> dict:
+        with self._lock:
+            self._namespaces.pop(namespace, None)
+        return {}
+
+
+_local_client = LocalMemoryClient()
+
 
 def _memory_client():
     """
@@ -30,11 +273,12 @@ def _memory_client():
 
     Using a factory (rather than a module-level singleton) makes the client
     easy to mock in tests — callers can monkeypatch `memory._memory_client`.
+    The client itself is shared and cached by aws_clients. With
+    MEMORY_BACKEND=local a process-wide LocalMemoryClient is returned instead.
     """
-    return boto3.client(
-        "bedrock-agentcore-memory",
-        region_name=os.environ.get("AWS_REGION", "us-east-1"),
-    )
+    if MEMORY_BACKEND == "local":
+        return _local_client
+    return aws_clients.get_client("bedrock-agentcore-memory")
 
 
 def _namespace(tenant_id: str) -> str:
@@ -42,24 +286,26 @@ def _namespace(tenant_id: str) -> str:
     return f"tenant_{tenant_id}"
 
 
-async def load_memory_on_session_start(tenant_id: str) -> Optional[str]:
-    """
-    Retrieve historical memory summaries for *tenant_id* at session start.
+def _fetch_summaries(tenant_id: str) -> Optional[MemoryIndex]:
+    client = _memory_client()
+    response = client.retrieve_memories(
+        memoryId=MEMORY_STORE_ID,
+        namespace=_namespace(tenant_id),
+        maxResults=MEMORY_RETRIEVE_MAX,
+    )
+    summaries = [m["content"] for m in response.get("memories", [])]
+    return MemoryIndex(summaries) if summaries else None
 
-    On ANY exception the function logs a WARNING and returns None so that the
-    session continues without memory context (graceful degradation, req 6.6).
 
-    Requirements: 6.2, 6.6
+def _retrieve_summaries(tenant_id: str) -> Optional[MemoryIndex]:
     """
+    Blocking retrieve that fills the recall cache; logs and returns None on
+    any error (requirement 6.6). Failures are not cached.
+    """
+    namespace = _namespace(tenant_id)
+    generation = _recall_cache.generation
     try:
-        client = _memory_client()
-        response = client.retrieve_memories(
-            memoryId=MEMORY_STORE_ID,
-            namespace=_namespace(tenant_id),
-            maxResults=10,
-        )
-        summaries = [m["content"] for m in response.get("memories", [])]
-        return "\n".join(summaries) if summaries else None
+        value = _fetch_summaries(tenant_id)
     except Exception as e:
         logger.warning(
             "AgentCore Memory 读取失败，降级继续 tenant_id=%s error=%s",
@@ -67,9 +313,160 @@ async def load_memory_on_session_start(tenant_id: str) -> Optional[str]:
             e,
         )
         return None  # graceful degradation — session continues without memory
+    _recall_cache.put(namespace, value, generation)
+    return value
 
 
-async def save_memory_on_session_end(tenant_id: str, session_summary: str) -> None:
+async def _off_loop(fn: Callable[..., T], *args, timeout: Optional[float]) -> T:
+    """
+    Run blocking *fn* on the memory executor without stalling the event loop.
+
+    Raises asyncio.TimeoutError after *timeout* seconds. On timeout or
+    cancellation the awaiting coroutine returns immediately; the boto3 call
+    itself cannot be interrupted and finishes in the background, bounded by
+    the client's read timeout.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(loop.run_in_executor(_executor, fn, *args), timeout)
+
+
+async def load_memory_on_session_start(
+    tenant_id: str, timeout: Optional[float] = MEMORY_TIMEOUT,
+    query: str = "", token_budget: int = MEMORY_TOKEN_BUDGET,
+) -> Optional[str]:
+    """
+    Retrieve historical memory summaries for *tenant_id* at session start.
+
+    Returns the summaries most relevant to *query* (usually the first
+    message) that fit in *token_budget* estimated tokens.
+
+    Served from the recall cache when possible; otherwise the boto3 call runs
+    on the memory executor. On ANY exception, or if it takes longer than
+    *timeout* seconds, the function logs a WARNING and returns None so that
+    the session continues without memory context (graceful degradation,
+    req 6.6). Cancellation propagates to the caller.
+
+    Requirements: 6.2, 6.6
+    """
+    try:
+        # shield: the retrieve may be shared with other callers (single-flight).
+        index = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(prefetch_memory(tenant_id))), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            "AgentCore Memory 读取超时，降级继续 tenant_id=%s timeout_s=%s", tenant_id, timeout,
+        )
+        return None
+    return index.select(query, token_budget) if index is not None else None
+
+
+def prefetch_memory(tenant_id: str) -> "Future[Optional[MemoryIndex]]":
+    """
+    Start retrieving *tenant_id*'s memory on the memory executor and return at once.
+
+    For synchronous callers (the HTTP handler threads) that want the fetch
+    to overlap with other session-start work; pass the future to
+    collect_prefetched_memory() when the result is needed. A cache hit
+    returns an already completed future.
+    """
+    namespace = _namespace(tenant_id)
+    hit, value = _recall_cache.get(namespace)
+    if hit:
+        future: "Future[Optional[MemoryIndex]]" = Future()
+        future.set_result(value)
+        return future
+    with _inflight_lock:
+        future = _inflight.get(namespace)
+        if future is not None:
+            return future
+        future = _executor.submit(_retrieve_summaries, tenant_id)
+        _inflight[namespace] = future
+    # Outside the lock: runs immediately if the fetch has already finished.
+    future.add_done_callback(lambda done, ns=namespace: _finish_inflight(ns, done))
+    return future
+
+
+def _finish_inflight(namespace: str, future: Future) -> None:
+    with _inflight_lock:
+        if _inflight.get(namespace) is future:
+            del _inflight[namespace]
+
+
+def collect_prefetched_memory(
+    future: "Future[Optional[MemoryIndex]]", timeout: Optional[float] = MEMORY_TIMEOUT,
+    query: str = "", token_budget: int = MEMORY_TOKEN_BUDGET,
+) -> Optional[str]:
+    """
+    Wait up to *timeout* seconds for a prefetch and return the summaries most
+    relevant to *query* within *token_budget*; None if it is not done by then.
+    """
+    try:
+        index = future.result(timeout)
+    except FutureTimeoutError:
+        # Not cancelled: other callers may share the fetch, and its result
+        # still warms the cache for the next turn.
+        logger.warning("AgentCore Memory 预取超时，降级继续 timeout_s=%s", timeout)
+        return None
+    return index.select(query, token_budget) if index is not None else None
+
+
+def _store_summary(tenant_id: str, session_summary: str, timestamp: Optional[float] = None) -> None:
+    client = _memory_client()
+    client.store_memory(
+        memoryId=MEMORY_STORE_ID,
+        namespace=_namespace(tenant_id),
+        content=session_summary,
+        metadata={"tenant_id": tenant_id, "timestamp": timestamp or time.time()},
+    )
+
+
+def _stored(tenant_id: str, session_summary: str) -> None:
+    _recall_cache.add(_namespace(tenant_id), session_summary)
+    logger.info(
+        "AgentCore Memory 写入成功 tenant_id=%s namespace=%s",
+        tenant_id,
+        _namespace(tenant_id),
+    )
+
+
+def start_memory_spool() -> SummarySpool:
+    """
+    Open the summary spool and start its flusher (idempotent). Called from
+    server startup so summaries left by a previous run are flushed; also
+    called lazily by the first write-behind save.
+    """
+    global _spool
+    with _spool_lock:
+        if _spool is None:
+            _spool = SummarySpool(_store_summary, on_stored=_stored)
+            _spool.start()
+            metrics.register_callback(
+                "openclaw_memory_spool_pending", "Session summaries waiting to be written to AgentCore Memory.",
+                _spool.pending,
+            )
+        return _spool
+
+
+def _spool_summary(tenant_id: str, session_summary: str) -> None:
+    start_memory_spool().append(tenant_id, session_summary)
+
+
+def stop_memory_spool(drain_timeout: float = MEMORY_SPOOL_DRAIN_SECONDS) -> int:
+    """Drain and stop the spool (server shutdown); returns summaries left on disk."""
+    global _spool
+    with _spool_lock:
+        spool, _spool = _spool, None
+    if spool is None:
+        return 0
+    return spool.stop(drain_timeout)
+
+
+def memory_spool_stats() -> Optional[dict]:
+    return _spool.stats() if _spool is not None else None
+
+
+async def save_memory_on_session_end(
+    tenant_id: str, session_summary: str, timeout: Optional[float] = MEMORY_TIMEOUT,
+) -> None:
     """
     Persist *session_summary* to the tenant's Memory namespace after a session.
 
@@ -77,6 +474,11 @@ async def save_memory_on_session_end(tenant_id: str, session_summary: str) -> No
     prompt-injection patterns, it is discarded and the failure is logged — the
     response is not affected (requirement 6.6).
 
+    In write-behind mode the summary is appended to the local spool and this
+    returns without a remote call; *timeout* then bounds only the append.
+    Otherwise the write runs on the memory executor and is abandoned (and
+    logged) after *timeout* seconds.
+
     Requirements: 6.3, 6.6
     """
     # Safety check: reject summaries containing injection patterns
@@ -92,17 +494,17 @@ async def save_memory_on_session_end(tenant_id: str, session_summary: str) -> No
         return  # Do not write poisoned content
 
     try:
-        client = _memory_client()
-        client.store_memory(
-            memoryId=MEMORY_STORE_ID,
-            namespace=_namespace(tenant_id),
-            content=session_summary,
-            metadata={"tenant_id": tenant_id, "timestamp": time.time()},
-        )
-        logger.info(
-            "AgentCore Memory 写入成功 tenant_id=%s namespace=%s",
+        if MEMORY_WRITE_BEHIND:
+            await _off_loop(_spool_summary, tenant_id, session_summary, timeout=timeout)
+            logger.info("AgentCore Memory 已加入写入队列 tenant_id=%s", tenant_id)
+            return
+        await _off_loop(_store_summary, tenant_id, session_summary, timeout=timeout)
+        _stored(tenant_id, session_summary)
+    except asyncio.TimeoutError:
+        logger.error(
+            "AgentCore Memory 写入超时 tenant_id=%s timeout_s=%s",
             tenant_id,
-            _namespace(tenant_id),
+            timeout,
         )
     except Exception as e:
         logger.error(
@@ -112,27 +514,51 @@ async def save_memory_on_session_end(tenant_id: str, session_summary: str) -> No
         )
 
 
-async def clear_tenant_memory(tenant_id: str) -> bool:
+def _delete_memories(tenant_id: str) -> None:
+    client = _memory_client()
+    client.delete_memories(
+        memoryId=MEMORY_STORE_ID,
+        namespace=_namespace(tenant_id),
+    )
+
+
+def _clear_memories(tenant_id: str) -> None:
+    if MEMORY_WRITE_BEHIND or _spool is not None:
+        discarded = start_memory_spool().discard(tenant_id)
+        if discarded:
+            logger.info("AgentCore Memory 已丢弃待写入摘要 tenant_id=%s count=%d", tenant_id, discarded)
+    _delete_memories(tenant_id)
+
+
+async def clear_tenant_memory(tenant_id: str, timeout: Optional[float] = MEMORY_TIMEOUT) -> bool:
     """
     Clear all memory entries for *tenant_id* (supports the ``/memory clear``
     command, requirement 6.7).
 
-    Returns True on success, False on failure (failure is logged at ERROR).
+    Summaries still waiting in the write-behind spool are discarded first,
+    so the flusher cannot write them back after the clear.
+
+    Returns True on success, False on failure or after *timeout* seconds
+    (failure is logged at ERROR).
 
     Requirements: 6.7
     """
     try:
-        client = _memory_client()
-        client.delete_memories(
-            memoryId=MEMORY_STORE_ID,
-            namespace=_namespace(tenant_id),
-        )
+        await _off_loop(_clear_memories, tenant_id, timeout=timeout)
+        _recall_cache.invalidate(_namespace(tenant_id))
         logger.info(
             "AgentCore Memory 已清除 tenant_id=%s namespace=%s",
             tenant_id,
             _namespace(tenant_id),
         )
         return True
+    except asyncio.TimeoutError:
+        logger.error(
+            "AgentCore Memory 清除超时 tenant_id=%s timeout_s=%s",
+            tenant_id,
+            timeout,
+        )
+        return False
     except Exception as e:
         logger.error(
             "AgentCore Memory 清除失败 tenant_id=%s error=%s",
@@ -140,3 +566,188 @@ async def clear_tenant_memory(tenant_id: str) -> bool:
             e,
         )
         return False
+
+
+def _list_memories(tenant_id: str) -> List[Tuple[str, float, str]]:
+    """(content, timestamp, memoryRecordId) of up to one page of summaries."""
+    client = _memory_client()
+    response = client.retrieve_memories(
+        memoryId=MEMORY_STORE_ID,
+        namespace=_namespace(tenant_id),
+        maxResults=MEMORY_COMPACTION_MAX_RESULTS,
+    )
+    return [
+        (m["content"], float((m.get("metadata") or {}).get("timestamp") or 0), m["memoryRecordId"])
+        for m in response.get("memories", [])
+    ]
+
+
+def _content_key(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def compact_tenant_memory(tenant_id: str, dry_run: bool = False) -> dict:
+    """
+    Merge near-duplicate summaries in *tenant_id*'s namespace and rewrite them.
+
+    Summaries are placed oldest first. A summary whose estimated similarity
+    (Jaccard, or containment of the shorter one in the longer) to a kept one
+    reaches MEMORY_DEDUP_THRESHOLD is merged with it: the newer
+    text is kept and the older one's sentences it lacks are appended, with
+    the newer timestamp. Only summaries added since the previous run (whose
+    signatures are kept in MEMORY_COMPACTION_STATE_PATH) are hashed and
+    placed; if there are none, the run is skipped.
+
+    A namespace holding MEMORY_COMPACTION_MAX_RESULTS summaries or more is
+    not rewritten (status ``truncated``), since retrieve cannot page past it.
+
+    When something changed (and not *dry_run*), each merged summary is stored
+    first and only then are the records it replaces deleted, by record id;
+    the namespace is never cleared, so summaries saved meanwhile (by the
+    server's spool, say) are left alone. If a store fails, the records it
+    would have replaced stay. The run is abandoned if a record it means to
+    delete has already gone (a concurrent clear).
+
+    Returns (and logs as a ``memory_compaction`` entry) a report with the
+    summary counts and bytes before and after.
+    """
+    import memory_dedup  # offline job only; keeps MinHash/LSH off the server's import path
+
+    namespace = _namespace(tenant_id)
+    with _compaction_lock:
+        memories = _list_memories(tenant_id)
+        truncated = len(memories) >= MEMORY_COMPACTION_MAX_RESULTS
+        current: Dict[str, Tuple[str, float]] = {}
+        records: Dict[str, List[Tuple[str, float]]] = {}  # content key -> (record id, timestamp)
+        for content, timestamp, record_id in memories:
+            key = _content_key(content)
+            records.setdefault(key, []).append((record_id, timestamp))
+            if key not in current or current[key][1] < timestamp:
+                current[key] = (content, timestamp)
+
+        state = _compaction_store()
+        previous = state.load(namespace).signatures()
+        index = memory_dedup.SignatureIndex()
+        kept: Dict[str, Tuple[str, float]] = {}
+        # Records each kept summary stands for (itself included).
+        sources: Dict[str, List[Tuple[str, float]]] = {}
+        for key, (sig, size) in previous.items():
+            if key in current:
+                index.add(key, sig, size)
+                kept[key] = current[key]
+                sources[key] = records[key]
+        added = sorted((k for k in current if k not in kept), key=lambda k: current[k][1])
+
+        merged = 0
+        for key in added:
+            content, timestamp = current[key]
+            sig, size = memory_dedup.signature(content)
+            match = index.best_match(sig, size, MEMORY_DEDUP_THRESHOLD)
+            if match is None:
+                index.add(key, sig, size)
+                kept[key] = (content, timestamp)
+                sources[key] = records[key]
+                continue
+            other, other_ts = kept.pop(match[0])
+            folded = sources.pop(match[0]) + records[key]
+            index.remove(match[0])
+            if timestamp >= other_ts:
+                content = memory_dedup.merge(content, other)
+            else:
+                content = memory_dedup.merge(other, content)
+            merged += 1
+            key = _content_key(content)
+            index.add(key, *memory_dedup.signature(content))
+            kept[key] = (content, max(timestamp, other_ts))
+            sources[key] = sources.get(key, []) + folded
+
+        bytes_before = sum(len(c.encode("utf-8")) for c, _, _ in memories)
+        bytes_after = sum(len(c.encode("utf-8")) for c, _ in kept.values())
+        changed = len(kept) < len(memories)
+        report = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "log_stream": f"tenant_{tenant_id}",
+            "event_type": "memory_compaction",
+            "tenant_id": tenant_id,
+            "dry_run": dry_run,
+            "summaries_before": len(memories),
+            "summaries_after": len(kept),
+            "summaries_added_since_last_run": len(added),
+            "merged": merged,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_saved": bytes_before - bytes_after,
+            "status": "compacted" if changed else ("unchanged" if added or not previous else "skipped"),
+        }
+        if truncated:
+            report["status"] = "truncated"
+            logger.warning(
+                "AgentCore Memory 摘要数达到读取上限，跳过压缩 tenant_id=%s count=%d max=%d",
+                tenant_id, len(memories), MEMORY_COMPACTION_MAX_RESULTS,
+            )
+        elif changed and not dry_run:
+            present = {record_id for _, _, record_id in _list_memories(tenant_id)}
+            if any(record_id not in present for _, _, record_id in memories):
+                report["status"] = "aborted"  # cleared or rewritten meanwhile; next run starts over
+            else:
+                _rewrite_records(tenant_id, kept, sources, records)
+        if not dry_run and report["status"] not in ("aborted", "truncated"):
+            state.save(namespace, index)
+        if dry_run and changed and not truncated:
+            report["status"] = "would_compact"
+
+    from observability import emit_structured
+
+    emit_structured(dict(report), with_trace=False)
+    return report
+
+
+def _compaction_store() -> "memory_dedup.SignatureStore":
+    """The compaction signature store; callers hold _compaction_lock."""
+    import memory_dedup
+
+    global _compaction_state
+    if _compaction_state is None:
+        _compaction_state = memory_dedup.SignatureStore(MEMORY_COMPACTION_STATE_PATH)
+    return _compaction_state
+
+
+def _rewrite_records(
+    tenant_id: str,
+    kept: Dict[str, Tuple[str, float]],
+    sources: Dict[str, List[Tuple[str, float]]],
+    records: Dict[str, List[Tuple[str, float]]],
+) -> None:
+    client = _memory_client()
+    for key, (content, timestamp) in sorted(kept.items(), key=lambda item: item[1][1]):
+        # A record already holding this text and timestamp is kept as is.
+        reused = next((rid for rid, ts in records.get(key, []) if ts == timestamp), None)
+        if reused is None:
+            try:
+                _store_summary(tenant_id, content, timestamp or None)
+            except Exception as e:
+                logger.warning("AgentCore Memory 压缩回写失败，保留原摘要 tenant_id=%s error=%s", tenant_id, e)
+                continue
+        for record_id, _ in sources[key]:
+            if record_id == reused:
+                continue
+            try:
+                client.delete_memory_record(
+                    memoryId=MEMORY_STORE_ID, namespace=_namespace(tenant_id), memoryRecordId=record_id,
+                )
+            except Exception as e:
+                # The duplicate stays and is merged again on the next run.
+                logger.warning(
+                    "AgentCore Memory 删除已合并摘要失败 tenant_id=%s record_id=%s error=%s", tenant_id, record_id, e,
+                )
+    _recall_cache.invalidate(_namespace(tenant_id))
+
+
+def memory_recall_stats() -> dict:
+    """Hit/miss counters, hit rate and size of the memory recall cache."""
+    return _recall_cache.stats()
+
+
+def shutdown_memory_executor(wait: bool = False) -> None:
+    """Stop accepting memory work; queued calls are cancelled (server shutdown)."""
+    _executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,211 @@
+"""
+Near-duplicate detection for memory summaries (MinHash + LSH).
+
+Each summary is reduced to its word 3-gram shingles (terms as in
+memory_rank.tokenize, so CJK text shingles by character) and a MinHash
+signature of MINHASH_PERMUTATIONS values. SignatureIndex buckets signatures
+by LSH bands; two summaries sharing a bucket are compared by estimated
+Jaccard similarity, or by containment when one summary repeats most of
+another and adds a little (the usual pattern of chatty tenants), so finding
+duplicates for a new summary does not scan every existing one.
+
+With 128 permutations in 32 bands of 4 rows, pairs from about 0.4 Jaccard
+upwards are likely to become candidates; the caller's threshold decides.
+
+SignatureStore keeps indexes in a SQLite file between processes, so a
+one-shot job can start from the signatures its previous run left behind.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from memory_rank import tokenize
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+# Term-set similarity at which merge() treats two sentences as the same.
+SENTENCE_OVERLAP = 0.8
+_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 64) - 1
+
+
+def _permutations() -> List[Tuple[int, int]]:
+    # Deterministic, so signatures stay comparable across runs and processes.
+    params = []
+    for i in range(MINHASH_PERMUTATIONS):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _PRIME
+        params.append((a, b))
+    return params
+
+
+_PARAMS = _permutations()
+
+Signature = Tuple[int, ...]
+
+_PACK = struct.Struct(f"<{MINHASH_PERMUTATIONS}Q")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?。！？])\s*|\n+")
+
+
+def shingles(text: str) -> Set[int]:
+    terms = tokenize(text)
+    if len(terms) < SHINGLE_SIZE:
+        grams = [" ".join(terms)] if terms else []
+    else:
+        grams = [" ".join(terms[i:i + SHINGLE_SIZE]) for i in range(len(terms) - SHINGLE_SIZE + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+        for g in grams
+    }
+
+
+def signature(text: str) -> Tuple[Signature, int]:
+    """MinHash signature of *text* and its shingle count."""
+    hashed = shingles(text)
+    if not hashed:
+        return (_MASK,) * MINHASH_PERMUTATIONS, 0
+    return tuple(min((a * h + b) % _PRIME for h in hashed) for a, b in _PARAMS), len(hashed)
+
+
+def similarity(left: Signature, right: Signature) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for x, y in zip(left, right) if x == y) / MINHASH_PERMUTATIONS
+
+
+def overlap(left: Signature, left_size: int, right: Signature, right_size: int) -> float:
+    """
+    Estimated similarity of two summaries: the larger of their Jaccard
+    similarity and the share of the smaller one's shingles found in the other.
+    """
+    jaccard = similarity(left, right)
+    smaller = min(left_size, right_size)
+    if not smaller:
+        return jaccard
+    shared = jaccard * (left_size + right_size) / (1 + jaccard)
+    return max(jaccard, min(1.0, shared / smaller))
+
+
+def _sentences(text: str) -> List[Tuple[str, Set[str]]]:
+    parts = (part.strip() for part in _SENTENCE_RE.split(text))
+    return [(part, set(tokenize(part))) for part in parts if part]
+
+
+def merge(kept: str, duplicate: str) -> str:
+    """Append the sentences of *duplicate* that *kept* has nothing close to."""
+    seen = [terms for _, terms in _sentences(kept)]
+    extra = []
+    for sentence, terms in _sentences(duplicate):
+        if not terms or any(len(terms & other) / len(terms | other) >= SENTENCE_OVERLAP for other in seen):
+            continue
+        extra.append(sentence)
+        seen.append(terms)
+    return " ".join([kept.strip()] + extra) if extra else kept
+
+
+class SignatureIndex:
+    """LSH buckets over signatures keyed by an arbitrary string id."""
+
+    def __init__(self):
+        self._signatures: Dict[str, Tuple[Signature, int]] = {}
+        self._buckets: Dict[Tuple[int, Signature], Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, sig: Signature):
+        for band in range(LSH_BANDS):
+            yield band, sig[band * _ROWS:(band + 1) * _ROWS]
+
+    def add(self, key: str, sig: Signature, size: int) -> None:
+        self.remove(key)
+        self._signatures[key] = (sig, size)
+        for band in self._bands(sig):
+            self._buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        for band in self._bands(entry[0]):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def best_match(self, sig: Signature, size: int, threshold: float) -> Optional[Tuple[str, float]]:
+        """The indexed key whose overlap() with *sig* is highest and at least *threshold*."""
+        candidates: Set[str] = set()
+        for band in self._bands(sig):
+            candidates |= self._buckets.get(band, set())
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            score = overlap(sig, size, *self._signatures[key])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def signatures(self) -> Dict[str, Tuple[Signature, int]]:
+        return dict(self._signatures)
+
+
+class SignatureStore:
+    """Per-namespace SignatureIndex contents persisted in a SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def load(self, namespace: str) -> SignatureIndex:
+        """The index saved for *namespace* (empty if none)."""
+        index = SignatureIndex()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, size, signature FROM signatures WHERE namespace = ?", (namespace,),
+            ).fetchall()
+        for key, size, blob in rows:
+            if len(blob) == _PACK.size:  # rows from another permutation count are ignored
+                index.add(key, _PACK.unpack(blob), size)
+        return index
+
+    def save(self, namespace: str, index: SignatureIndex) -> None:
+        """Replace what is stored for *namespace* with *index*."""
+        rows = [
+            (namespace, key, size, _PACK.pack(*sig))
+            for key, (sig, size) in index.signatures().items()
+        ]
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM signatures WHERE namespace = ?", (namespace,))
+                self._db.executemany(
+                    "INSERT INTO signatures (namespace, key, size, signature) VALUES (?, ?, ?, ?)", rows,
+                )
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
@@ -0,0 +1,108 @@
+"""
+Relevance ranking for recalled memory summaries.
+
+MemoryIndex keeps a BM25 index over one tenant's summaries. select() scores
+them against the current message and packs the best into a token budget, so
+the prompt carries the most relevant history instead of the first N results
+of a retrieve. The index is built once per recall-cache fill and add() updates
+it in place when a new summary is stored.
+
+Text is tokenised into lower-cased word runs, with each CJK character its own
+term. Token counts for the budget are estimated (one per CJK character, one
+per four other characters); no model tokenizer is loaded.
+"""
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable, List, Optional
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"  # kana, CJK ideographs, hangul
+_TERM_RE = re.compile(rf"[^\W{_CJK}]+|[{_CJK}]")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+# Standard BM25 parameters.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_DOC_OVERHEAD_BYTES = 64  # rough per-summary cost of the term counts
+
+
+def tokenize(text: str) -> List[str]:
+    return _TERM_RE.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+class MemoryIndex:
+    """BM25 index over a tenant's summaries; safe to share between threads."""
+
+    def __init__(self, docs: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._docs: List[str] = []
+        self._terms: List[Counter] = []
+        self._lengths: List[int] = []
+        self._df: Counter = Counter()
+        self._total_length = 0
+        self.size_bytes = 0
+        for doc in docs:
+            self.add(doc)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc: str) -> None:
+        """Index one more summary (the newest)."""
+        terms = Counter(tokenize(doc))
+        length = sum(terms.values())
+        with self._lock:
+            self._docs.append(doc)
+            self._terms.append(terms)
+            self._lengths.append(length)
+            self._df.update(terms.keys())
+            self._total_length += length
+            self.size_bytes += 2 * len(doc.encode("utf-8")) + _DOC_OVERHEAD_BYTES
+
+    def _scores(self, query_terms: set) -> List[float]:
+        count = len(self._docs)
+        avg_length = (self._total_length / count) or 1.0
+        idf = {
+            term: math.log(1 + (count - self._df[term] + 0.5) / (self._df[term] + 0.5))
+            for term in query_terms if term in self._df
+        }
+        scores = []
+        for terms, length in zip(self._terms, self._lengths):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+            scores.append(sum(
+                weight * terms[term] * (BM25_K1 + 1) / (terms[term] + norm)
+                for term, weight in idf.items() if term in terms
+            ))
+        return scores
+
+    def select(self, query: str, token_budget: int) -> Optional[str]:
+        """
+        Return the summaries that best match *query*, best first, within
+        *token_budget* estimated tokens (None if nothing fits).
+
+        Only summaries sharing a term with the query are used; when none do,
+        the newest summaries fill the budget instead. Ties prefer newer ones.
+        """
+        with self._lock:
+            if not self._docs:
+                return None
+            docs = list(self._docs)
+            scores = self._scores(set(tokenize(query)))
+        order = sorted(range(len(docs)), key=lambda i: (scores[i], i), reverse=True)
+        if scores[order[0]] > 0:
+            order = [i for i in order if scores[i] > 0]
+        picked: List[str] = []
+        used = 0
+        for i in order:
+            cost = estimate_tokens(docs[i])
+            if used + cost <= token_budget:
+                picked.append(docs[i])
+                used += cost
+        return "\n".join(picked) if picked else None
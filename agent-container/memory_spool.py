@@ -0,0 +1,227 @@
+"""
+Write-behind spool for session summaries.
+
+save_memory_on_session_end() appends summaries here instead of calling
+AgentCore Memory on the session's teardown path. A background thread flushes
+due rows in batches of MEMORY_SPOOL_BATCH; a row that fails is retried with
+exponential backoff (MEMORY_SPOOL_BACKOFF_SECONDS doubling up to
+MEMORY_SPOOL_BACKOFF_MAX_SECONDS) and dropped, with an ERROR log, after
+MEMORY_SPOOL_MAX_ATTEMPTS.
+
+Rows live in a SQLite file (WAL journal), so summaries survive a remote
+outage and a process restart within the same microVM: rows left over from a
+previous run are flushed when the spool starts. stop() drains what it can
+within a deadline; anything still pending stays on disk.
+"""
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MEMORY_SPOOL_PATH = os.environ.get("MEMORY_SPOOL_PATH", "/tmp/openclaw/memory-spool.db")
+MEMORY_SPOOL_BATCH = int(os.environ.get("MEMORY_SPOOL_BATCH", "16"))
+MEMORY_SPOOL_MAX_ATTEMPTS = int(os.environ.get("MEMORY_SPOOL_MAX_ATTEMPTS", "8"))
+MEMORY_SPOOL_BACKOFF = float(os.environ.get("MEMORY_SPOOL_BACKOFF_SECONDS", "1"))
+MEMORY_SPOOL_BACKOFF_MAX = float(os.environ.get("MEMORY_SPOOL_BACKOFF_MAX_SECONDS", "60"))
+# Upper bound on how long stop() keeps flushing at shutdown.
+MEMORY_SPOOL_DRAIN_SECONDS = float(os.environ.get("MEMORY_SPOOL_DRAIN_SECONDS", "10"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tenant_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+)
+"""
+
+# store(tenant_id, content, created_at) performs the remote write and raises on failure.
+StoreFn = Callable[[str, str, float], None]
+
+
+class SummarySpool:
+    """Durable queue of (tenant_id, summary) rows with a background flusher."""
+
+    def __init__(
+        self,
+        store: StoreFn,
+        path: str = MEMORY_SPOOL_PATH,
+        on_stored: Optional[Callable[[str, str], None]] = None,
+    ):
+        self._store = store
+        self._on_stored = on_stored
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db_lock = threading.Lock()
+        # Held while one row is written and removed, so discard() never
+        # races a store that is already in flight for the same tenant.
+        self._row_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._hold_until = 0.0  # monotonic; no flushing before this after a failure
+        self.flushed = 0
+        self.failures = 0
+        self.dropped = 0
+
+    # -- producer side ------------------------------------------------------
+
+    def append(self, tenant_id: str, content: str, created_at: Optional[float] = None) -> None:
+        """Persist one summary locally and wake the flusher."""
+        with self._db_lock:
+            self._db.execute(
+                "INSERT INTO spool (tenant_id, content, created_at) VALUES (?, ?, ?)",
+                (tenant_id, content, created_at or time.time()),
+            )
+        self._wake.set()
+
+    def discard(self, tenant_id: str) -> int:
+        """
+        Delete *tenant_id*'s unflushed rows (``/memory clear``) and return
+        how many were dropped. Waits for a write already in flight, so no
+        row of the tenant is stored after this returns.
+        """
+        with self._row_lock, self._db_lock:
+            return self._db.execute("DELETE FROM spool WHERE tenant_id = ?", (tenant_id,)).rowcount
+
+    def pending(self) -> int:
+        with self._db_lock:
+            return self._db.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    # -- flusher ------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="memory-spool", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain_timeout: float = MEMORY_SPOOL_DRAIN_SECONDS) -> int:
+        """
+        Stop the flusher and drain, both within *drain_timeout* (a write
+        already in flight may still overrun it); returns rows left.
+        """
+        deadline = time.monotonic() + drain_timeout
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join(max(0.0, deadline - time.monotonic()))
+            if self._thread.is_alive():
+                logger.warning("memory spool flusher still writing at shutdown path=%s", self.path)
+            self._thread = None
+        self.drain(max(0.0, deadline - time.monotonic()))
+        left = self.pending()
+        if left:
+            logger.warning("memory spool stopped with %d summaries pending path=%s", left, self.path)
+        return left
+
+    def drain(self, timeout: float) -> None:
+        """Flush every row now, ignoring backoff, until empty, a failed pass or *timeout*."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            done, failed = self.flush(ignore_backoff=True, deadline=deadline)
+            if failed or not done:
+                return
+
+    def flush(self, ignore_backoff: bool = False, deadline: Optional[float] = None) -> Tuple[int, bool]:
+        """
+        Write one batch of due rows. Stops at the first failure, since an
+        outage would fail the rest of the batch too, and between rows once
+        *deadline* (monotonic) passes or, without one, once stop() was
+        called. Returns (rows stored, whether a write failed).
+        """
+        now = time.time()
+        with self._db_lock:
+            rows: List[tuple] = self._db.execute(
+                "SELECT id, tenant_id, content, created_at, attempts FROM spool "
+                "WHERE next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (float("inf") if ignore_backoff else now, MEMORY_SPOOL_BATCH),
+            ).fetchall()
+        stored = 0
+        for row_id, tenant_id, content, created_at, attempts in rows:
+            if self._stopping.is_set() if deadline is None else time.monotonic() >= deadline:
+                break
+            with self._row_lock:
+                with self._db_lock:
+                    if self._db.execute("SELECT 1 FROM spool WHERE id = ?", (row_id,)).fetchone() is None:
+                        continue  # discarded since the batch was read
+                try:
+                    self._store(tenant_id, content, created_at)
+                except Exception as e:
+                    self._record_failure(row_id, tenant_id, attempts + 1, e)
+                    return stored, True
+                with self._db_lock:
+                    self._db.execute("DELETE FROM spool WHERE id = ?", (row_id,))
+            stored += 1
+            self.flushed += 1
+            if self._on_stored is not None:
+                self._on_stored(tenant_id, content)
+        return stored, False
+
+    def _record_failure(self, row_id: int, tenant_id: str, attempts: int, error: Exception) -> None:
+        self.failures += 1
+        if attempts >= MEMORY_SPOOL_MAX_ATTEMPTS:
+            self.dropped += 1
+            with self._db_lock:
+                self._db.execute("DELETE FROM spool WHERE id = ?", (row_id,))
+            logger.error(
+                "memory spool dropped summary after %d attempts tenant_id=%s error=%s",
+                attempts, tenant_id, error,
+            )
+            return
+        delay = min(MEMORY_SPOOL_BACKOFF * (2 ** (attempts - 1)), MEMORY_SPOOL_BACKOFF_MAX)
+        delay *= random.uniform(0.8, 1.2)
+        self._hold_until = time.monotonic() + delay
+        with self._db_lock:
+            self._db.execute(
+                "UPDATE spool SET attempts = ?, next_attempt_at = ? WHERE id = ?",
+                (attempts, time.time() + delay, row_id),
+            )
+        logger.warning(
+            "memory spool write failed, retrying in %.1fs tenant_id=%s attempt=%d error=%s",
+            delay, tenant_id, attempts, error,
+        )
+
+    def _next_due_in(self) -> Optional[float]:
+        with self._db_lock:
+            due = self._db.execute("SELECT MIN(next_attempt_at) FROM spool").fetchone()[0]
+        return None if due is None else max(0.0, due - time.time())
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            # After a failure, hold off the whole queue (new appends included)
+            # rather than trying the next row straight into the same outage.
+            hold = self._hold_until - time.monotonic()
+            if hold > 0:
+                self._stopping.wait(hold)
+                continue
+            self._wake.clear()
+            try:
+                stored, failed = self.flush()
+                if stored or failed:
+                    continue  # more rows may be due, or a backoff to observe
+                wait = self._next_due_in()
+            except Exception as e:
+                logger.error("memory spool flush error=%s", e)
+                wait = MEMORY_SPOOL_BACKOFF
+            self._wake.wait(wait)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "flushed": self.flushed,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
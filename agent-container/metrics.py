@@ -0,0 +1,225 @@
+"""
+In-process Prometheus-style metrics for the /metrics endpoint.
+
+Counters and histograms are created once at import time. Each label
+combination gets a child holding preallocated slots, so recording a sample
+is a dict lookup plus a short uncontended lock — no per-request allocation
+beyond the first use of a label set. Values owned by other modules (cache
+statistics, in-flight requests, pending approvals) are read through
+callbacks at scrape time instead of being pushed on the request path.
+
+Rendered output follows the Prometheus text exposition format 0.0.4.
+"""
+import bisect
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Label sets beyond this per metric are folded into a single "other" child so
+# tenant-supplied values (e.g. tool names) cannot grow memory without bound.
+MAX_LABEL_SETS = 500
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+CallbackValue = Union[float, Dict[Tuple[str, ...], float]]
+
+_registry: List["_Metric"] = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._children_lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child for *values*, creating it on first use."""
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        with self._children_lock:
+            child = self._children.get(values)
+            if child is None:
+                if len(self._children) >= MAX_LABEL_SETS:
+                    values = ("other",) * len(self.labelnames)
+                    child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+            return child
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in list(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    A gauge or counter whose value is read from *callback* at scrape time.
+
+    The callback returns either a single number or a mapping of label-value
+    tuples to numbers.
+    """
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], CallbackValue],
+                 labelnames: Sequence[str] = (), type_name: str = "gauge"):
+        self.callback = callback
+        self.type_name = type_name
+        super().__init__(name, help_text, labelnames)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        value = self.callback()
+        samples = value.items() if isinstance(value, dict) else [((), value)]
+        for values, sample in samples:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(sample)}")
+        return lines
+
+
+def register_callback(name: str, help_text: str, callback: Callable[[], CallbackValue],
+                      labelnames: Sequence[str] = (), type_name: str = "gauge") -> CallbackMetric:
+    """Register (or replace) a scrape-time metric named *name*."""
+    with _registry_lock:
+        _registry[:] = [m for m in _registry if m.name != name]
+    return CallbackMetric(name, help_text, callback, labelnames, type_name)
+
+
+def render() -> bytes:
+    """Render every registered metric in Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines: List[str] = []
+    for metric in metrics:
+        try:
+            lines.extend(metric.render())
+        except Exception:  # a failing callback must not break the whole scrape
+            continue
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
+# ---------------------------------------------------------------------------
+# Shared metric definitions
+# ---------------------------------------------------------------------------
+
+INVOCATIONS = Counter(
+    "openclaw_invocations_total", "Agent invocations by final status.", ["status"],
+)
+UPSTREAM_LATENCY = Histogram(
+    "openclaw_upstream_latency_seconds", "Latency of openclaw chat-completions calls.",
+)
+SSM_CALLS = Counter(
+    "openclaw_ssm_calls_total", "SSM Parameter Store API calls by operation.", ["operation"],
+)
+PERMISSION_DENIALS = Counter(
+    "openclaw_permission_denials_total", "Permission denials by tool and source.", ["tool", "source"],
+)
@@ -6,15 +6,28 @@ All log entries are emitted via Python's standard logging module in the format:
 
 This prefix allows tests and log processors to reliably parse structured entries.
 
+By default entries are serialized and written synchronously. Long-running
+servers call ``start_log_pipeline()`` so that request threads only enqueue
+entries and a background writer serializes and emits them in batches; the
+wire format is the same in both modes.
+
+Entries emitted inside a tracing span carry its ``trace_id`` and ``span_id``.
+
 Requirements: 8.1, 8.2, 8.3, 8.4
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
+import random
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # Allow importing PermissionRequest from auth-agent when running inside agent-container
 _auth_agent_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "auth-agent")
@@ -26,14 +39,543 @@ try:
 except ImportError:
     PermissionRequest = None  # type: ignore[assignment,misc]
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import metrics  # noqa: E402
+from metrics import PERMISSION_DENIALS  # noqa: E402
+from tracing import current_ids  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
+# Async pipeline tuning: queue bound, records written per wake-up, and what
+# to do when the queue is full ("drop" the record or "block" the caller).
+LOG_QUEUE_SIZE = int(os.environ.get("STRUCTURED_LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.environ.get("STRUCTURED_LOG_BATCH_SIZE", "256"))
+LOG_OVERFLOW_POLICY = os.environ.get("STRUCTURED_LOG_OVERFLOW", "drop").lower()
+
+_STOP = object()
+
+
+class _LogPipeline:
+    """Bounded queue plus a daemon writer thread for structured log entries."""
+
+    def __init__(self, maxsize: int, batch_size: int, overflow: str):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._batch_size = max(1, batch_size)
+        self._block = overflow == "block"
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="structured-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, target: logging.Logger, level: int, prefix: str, entry: dict) -> None:
+        try:
+            self._queue.put((target, level, prefix, entry), block=self._block)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.enqueued += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            written = errors = 0
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                    continue
+                target, level, prefix, entry = item
+                # One unserializable entry or failing handler must not stop
+                # the writer: later entries (AUDIT lines included) still go out.
+                try:
+                    _write(target, level, prefix, entry)
+                    written += 1
+                except Exception as e:
+                    errors += 1
+                    sys.stderr.write(f"structured log write failed: {e!r}\n")
+            with self._lock:
+                self.written += written
+                self.errors += errors
+            if stop:
+                return
+
+    def close(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            sys.stderr.write(f"structured log writer did not drain within {timeout}s\n")
+            return
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+
+_pipeline: Optional[_LogPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def _write(target: logging.Logger, level: int, prefix: str, entry: dict) -> None:
+    target.log(level, prefix + " %s", json.dumps(entry))
+
+
+def emit_structured(
+    entry: dict,
+    level: int = logging.INFO,
+    prefix: str = "STRUCTURED_LOG",
+    target: Optional[logging.Logger] = None,
+    with_trace: bool = True,
+) -> None:
+    """
+    Emit ``{prefix} {json}`` for *entry* on *target* (default: this module's logger).
+
+    With *with_trace*, the current ``trace_id``/``span_id`` are added unless
+    the entry already sets them. When the async pipeline is running the entry
+    is only enqueued; callers must not mutate it afterwards.
+    """
+    target = target or logger
+    if with_trace:
+        for key, value in current_ids().items():
+            entry.setdefault(key, value)
+    pipeline = _pipeline
+    if pipeline is not None:
+        pipeline.submit(target, level, prefix, entry)
+    else:
+        _write(target, level, prefix, entry)
+
+
+def start_log_pipeline(
+    maxsize: int = LOG_QUEUE_SIZE,
+    batch_size: int = LOG_BATCH_SIZE,
+    overflow: str = LOG_OVERFLOW_POLICY,
+) -> None:
+    """Switch structured logging to the background writer (idempotent)."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = _LogPipeline(maxsize, batch_size, overflow)
+            atexit.register(stop_log_pipeline)
+
+
+def stop_log_pipeline(timeout: float = 5.0) -> None:
+    """Drain queued entries and return to synchronous logging."""
+    global _pipeline
+    flush_denial_aggregates()
+    with _pipeline_lock:
+        pipeline, _pipeline = _pipeline, None
+    if pipeline is not None:
+        pipeline.close(timeout)
+
+
+def log_pipeline_stats() -> dict:
+    """Return queue depth and enqueued/written/dropped/errors counters (empty if sync)."""
+    pipeline = _pipeline
+    return pipeline.stats() if pipeline is not None else {}
+
+
+metrics.register_callback(
+    "openclaw_structured_log_dropped_total", "Structured log entries dropped on queue overflow.",
+    lambda: log_pipeline_stats().get("dropped", 0), type_name="counter",
+)
+metrics.register_callback(
+    "openclaw_structured_log_errors_total", "Structured log entries the writer failed to emit.",
+    lambda: log_pipeline_stats().get("errors", 0), type_name="counter",
+)
+metrics.register_callback(
+    "openclaw_structured_log_queued", "Structured log entries waiting for the writer.",
+    lambda: log_pipeline_stats().get("queued", 0),
+)
+
+
+class StageTimer:
+    """
+    Collects wall-clock timings (milliseconds) for the stages of one request.
+
+    Stages are recorded in the order they finish. ``as_dict`` feeds the
+    ``stages_ms`` field of agent_invocation entries and ``server_timing``
+    renders the same data as a ``Server-Timing`` response header value.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def record(self, name: str, ms: float) -> None:
+        self._stages[name] = self._stages.get(name, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, float]:
+        stages = {name: round(ms, 2) for name, ms in self._stages.items()}
+        stages["total"] = round((time.perf_counter() - self._started) * 1000, 2)
+        return stages
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_dict().items())
+
+
+# ---------------------------------------------------------------------------
+# Denial log rate limiting
+# ---------------------------------------------------------------------------
+
+# Per (tenant, tool): the first DENIAL_LOG_BURST denials in each window are
+# logged in full; the rest are counted and reported as one
+# permission_denied_aggregate entry when the window closes. A window of 0
+# disables limiting. DENIAL_LOG_SAMPLE_RATE additionally logs that fraction of
+# suppressed denials in full.
+DENIAL_LOG_WINDOW = float(os.environ.get("DENIAL_LOG_WINDOW_SECONDS", "60"))
+DENIAL_LOG_BURST = int(os.environ.get("DENIAL_LOG_BURST", "5"))
+DENIAL_LOG_SAMPLE_RATE = float(os.environ.get("DENIAL_LOG_SAMPLE_RATE", "0"))
+
+
+class _DenialWindow:
+    __slots__ = ("started", "logged", "suppressed", "first_seen", "last_seen")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.logged = 0
+        self.suppressed = 0
+        self.first_seen: Optional[str] = None
+        self.last_seen: Optional[str] = None
+
+
+class _DenialLimiter:
+    def __init__(self, window: float, burst: int, sample_rate: float):
+        self.window = window
+        self.burst = burst
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._windows: Dict[tuple, _DenialWindow] = {}
+        self._last_sweep = time.monotonic()
+
+    def admit(self, tenant_id: str, tool_name: str) -> bool:
+        if self.window <= 0:
+            return True
+        now = time.monotonic()
+        key = (tenant_id, tool_name)
+        closed = []
+        with self._lock:
+            if now - self._last_sweep >= self.window:
+                closed = self._sweep(now)
+            window = self._windows.get(key)
+            if window is None or now - window.started >= self.window:
+                if window is not None and window.suppressed:
+                    closed.append((key, window))
+                window = self._windows[key] = _DenialWindow(now)
+            if window.logged < self.burst or (
+                self.sample_rate > 0 and random.random() < self.sample_rate
+            ):
+                window.logged += 1
+                admitted = True
+            else:
+                seen = datetime.now(timezone.utc).isoformat()
+                window.first_seen = window.first_seen or seen
+                window.last_seen = seen
+                window.suppressed += 1
+                admitted = False
+        for closed_key, closed_window in closed:
+            self._emit_aggregate(closed_key, closed_window)
+        return admitted
+
+    def sweep_expired(self) -> None:
+        """Emit aggregates for windows that have closed, even if no denial followed."""
+        if self.window <= 0:
+            return
+        with self._lock:
+            closed = self._sweep(time.monotonic())
+        for key, window in closed:
+            self._emit_aggregate(key, window)
+
+    def _sweep(self, now: float) -> list:
+        self._last_sweep = now
+        closed = []
+        for key, window in list(self._windows.items()):
+            if now - window.started >= self.window:
+                del self._windows[key]
+                if window.suppressed:
+                    closed.append((key, window))
+        return closed
+
+    def flush(self) -> None:
+        with self._lock:
+            closed = [(k, w) for k, w in self._windows.items() if w.suppressed]
+            self._windows.clear()
+        for key, window in closed:
+            self._emit_aggregate(key, window)
+
+    def _emit_aggregate(self, key: tuple, window: _DenialWindow) -> None:
+        tenant_id, tool_name = key
+        emit_structured({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "log_stream": f"tenant_{tenant_id}",
+            "tenant_id": tenant_id,
+            "event_type": "permission_denied_aggregate",
+            "tool_name": tool_name,
+            "suppressed_count": window.suppressed,
+            "logged_count": window.logged,
+            "first_seen": window.first_seen,
+            "last_seen": window.last_seen,
+            "window_seconds": self.window,
+        }, level=logging.WARNING, with_trace=False)
+
+
+_denial_limiter = _DenialLimiter(DENIAL_LOG_WINDOW, DENIAL_LOG_BURST, DENIAL_LOG_SAMPLE_RATE)
+
+
+def admit_denial_log(tenant_id: str, tool_name: str, always_log: bool = False) -> bool:
+    """
+    Return True if a permission_denied entry for (*tenant_id*, *tool_name*)
+    should be written in full. Denials with *always_log* (tools in
+    ALWAYS_BLOCKED_TOOLS) bypass the limiter.
+    """
+    return always_log or _denial_limiter.admit(tenant_id, tool_name)
+
+
+def flush_denial_aggregates() -> None:
+    """Emit aggregate entries for every window with suppressed denials."""
+    _denial_limiter.flush()
+
+
+# ---------------------------------------------------------------------------
+# CloudWatch Embedded Metric Format (EMF)
+# ---------------------------------------------------------------------------
+
+# Per-tenant aggregates are flushed as EMF documents every interval. EMF lines
+# must be bare JSON log events, so they bypass the logging format and go
+# straight to the sink: stdout by default, or the file named by EMF_SINK_PATH.
+EMF_NAMESPACE = os.environ.get("EMF_NAMESPACE", "OpenClaw/AgentContainer")
+EMF_FLUSH_INTERVAL = float(os.environ.get("EMF_FLUSH_INTERVAL_SECONDS", "60"))
+EMF_SINK_PATH = os.environ.get("EMF_SINK_PATH", "")
+# Duration samples kept per tenant per interval (reservoir sampled beyond this).
+EMF_MAX_SAMPLES = int(os.environ.get("EMF_MAX_SAMPLES", "2048"))
+
+_EMF_COUNT_METRICS = [
+    {"Name": "Invocations", "Unit": "Count"},
+    {"Name": "Errors", "Unit": "Count"},
+    {"Name": "PermissionDenials", "Unit": "Count"},
+]
+_EMF_DURATION_METRICS = _EMF_COUNT_METRICS + [
+    {"Name": "DurationP50", "Unit": "Milliseconds"},
+    {"Name": "DurationP95", "Unit": "Milliseconds"},
+    {"Name": "DurationP99", "Unit": "Milliseconds"},
+    {"Name": "DurationMax", "Unit": "Milliseconds"},
+]
+
+
+class _TenantAggregate:
+    __slots__ = ("invocations", "errors", "denials", "durations", "seen", "max_ms")
+
+    def __init__(self):
+        self.invocations = 0
+        self.errors = 0
+        self.denials = 0
+        self.durations: List[float] = []
+        self.seen = 0
+        self.max_ms = 0.0
+
+    def add_duration(self, ms: float, max_samples: int) -> None:
+        self.seen += 1
+        self.max_ms = max(self.max_ms, ms)
+        if len(self.durations) < max_samples:
+            self.durations.append(ms)
+        else:
+            slot = random.randrange(self.seen)
+            if slot < max_samples:
+                self.durations[slot] = ms
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class _EmfAggregator:
+    """In-process per-tenant counters flushed as one EMF document per tenant."""
+
+    def __init__(self, namespace: str, max_samples: int):
+        self.namespace = namespace
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._tenants: Dict[str, _TenantAggregate] = {}
+
+    def _tenant(self, tenant_id: str) -> _TenantAggregate:
+        agg = self._tenants.get(tenant_id)
+        if agg is None:
+            agg = self._tenants[tenant_id] = _TenantAggregate()
+        return agg
+
+    def record_invocation(self, tenant_id: str, duration_ms: float, status: str) -> None:
+        with self._lock:
+            agg = self._tenant(tenant_id)
+            agg.invocations += 1
+            if status != "success":
+                agg.errors += 1
+            agg.add_duration(float(duration_ms), self.max_samples)
+
+    def record_denial(self, tenant_id: str) -> None:
+        with self._lock:
+            self._tenant(tenant_id).denials += 1
+
+    def drain(self) -> List[dict]:
+        """Return EMF documents for the interval and reset the aggregates."""
+        with self._lock:
+            tenants, self._tenants = self._tenants, {}
+        timestamp = int(time.time() * 1000)
+        documents = []
+        for tenant_id, agg in sorted(tenants.items()):
+            doc = {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [{
+                        "Namespace": self.namespace,
+                        "Dimensions": [["TenantId"]],
+                        "Metrics": _EMF_DURATION_METRICS if agg.durations else _EMF_COUNT_METRICS,
+                    }],
+                },
+                "TenantId": tenant_id,
+                "Invocations": agg.invocations,
+                "Errors": agg.errors,
+                "PermissionDenials": agg.denials,
+            }
+            if agg.durations:
+                ordered = sorted(agg.durations)
+                doc["DurationP50"] = _percentile(ordered, 50)
+                doc["DurationP95"] = _percentile(ordered, 95)
+                doc["DurationP99"] = _percentile(ordered, 99)
+                doc["DurationMax"] = agg.max_ms
+            documents.append(doc)
+        return documents
+
+
+class _EmfFlusher:
+    """
+    Writes EMF documents every *interval* seconds and, on the same thread,
+    closes expired denial-log windows so their permission_denied_aggregate
+    entries appear within one tick of the window ending. Either job can be
+    disabled with a non-positive interval.
+    """
+
+    def __init__(self, aggregator: _EmfAggregator, interval: float, sink_path: str,
+                 sweep_interval: float = DENIAL_LOG_WINDOW):
+        self.aggregator = aggregator
+        self.interval = interval
+        self.sink_path = sink_path
+        self._tick = min(t for t in (interval, sweep_interval) if t > 0)
+        self._next_flush = time.monotonic() + interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="emf-flusher", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._tick):
+            _denial_limiter.sweep_expired()
+            if self.interval > 0 and time.monotonic() >= self._next_flush:
+                self._next_flush = time.monotonic() + self.interval
+                self.flush()
+
+    def flush(self) -> int:
+        documents = self.aggregator.drain()
+        if documents:
+            _write_emf(documents, self.sink_path)
+        return len(documents)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(self._tick + 1)
+        if self.interval > 0:
+            self.flush()
+
+
+def _write_emf(documents: List[dict], sink_path: str) -> None:
+    data = "".join(json.dumps(doc, separators=(",", ":")) + "\n" for doc in documents)
+    try:
+        if sink_path:
+            with open(sink_path, "a", encoding="utf-8") as f:
+                f.write(data)
+        else:
+            sys.stdout.write(data)
+            sys.stdout.flush()
+    except OSError as e:
+        logger.warning("EMF flush failed documents=%d error=%s", len(documents), e)
+
+
+_emf_aggregator = _EmfAggregator(EMF_NAMESPACE, EMF_MAX_SAMPLES)
+_emf_flusher: Optional[_EmfFlusher] = None
+_emf_lock = threading.Lock()
+
+
+def record_permission_denial(tenant_id: str, tool_name: str, source: str) -> None:
+    """Count a denial in /metrics and in the tenant's EMF aggregate."""
+    PERMISSION_DENIALS.labels(tool_name, source).inc()
+    _emf_aggregator.record_denial(tenant_id)
+
+
+def start_emf_flusher(interval: float = EMF_FLUSH_INTERVAL, sink_path: str = EMF_SINK_PATH) -> None:
+    """
+    Start flushing per-tenant EMF documents every *interval* seconds, and
+    sweeping closed denial-log windows (idempotent).
+    """
+    global _emf_flusher
+    if interval <= 0 and DENIAL_LOG_WINDOW <= 0:
+        return
+    with _emf_lock:
+        if _emf_flusher is None:
+            _emf_flusher = _EmfFlusher(_emf_aggregator, interval, sink_path)
+
+
+def stop_emf_flusher() -> None:
+    """Stop the flusher and write out the final partial interval."""
+    global _emf_flusher
+    with _emf_lock:
+        flusher, _emf_flusher = _emf_flusher, None
+    if flusher is not None:
+        flusher.stop()
+
+
+def flush_emf(sink_path: str = EMF_SINK_PATH) -> int:
+    """Flush the current aggregates immediately. Returns the number of documents."""
+    documents = _emf_aggregator.drain()
+    if documents:
+        _write_emf(documents, sink_path)
+    return len(documents)
+
 
 def log_agent_invocation(
     tenant_id: str,
     tools_used: List[str],
     duration_ms: int,
     status: str,
+    tool_durations_ms: Optional[Dict[str, int]] = None,
+    stages_ms: Optional[Dict[str, float]] = None,
+    concurrency: Optional[Dict[str, int]] = None,
+    upstream_pool: Optional[Dict[str, float]] = None,
+    prompt_cache: Optional[Dict[str, int]] = None,
+    memory_cache: Optional[Dict[str, float]] = None,
 ) -> None:
     """
     Log a structured entry for each AgentCore Runtime invocation.
@@ -44,12 +586,22 @@ def log_agent_invocation(
     Fields emitted (requirement 8.1):
     - tenant_id
     - session_id  (= tenant_id)
-    - tools_used  (list)
+    - tools_used  (list of tool calls openclaw actually made, in call order)
     - duration_ms
     - status
     - timestamp
     - event_type  = "agent_invocation"
     - log_stream  = "tenant_{tenant_id}"
+    - tool_durations_ms  (per-tool total, only when openclaw reports it)
+    - stages_ms  (per-stage latency breakdown from StageTimer, optional)
+    - in_flight / queued / rejected / max_workers / max_queue  (only when *concurrency* is given)
+    - upstream_pool  (openclaw connection reuse rate and wait time, optional)
+    - prompt_cache   (system-prompt cache hits/misses/size, optional)
+    - memory_cache   (memory recall cache hit rate and size, optional)
+
+    The only module state it touches is the EMF aggregate (_emf_aggregator),
+    which is guarded by its own lock, so it is safe to call from the server's
+    worker threads concurrently.
 
     Requirements: 8.1, 8.4
     """
@@ -63,7 +615,20 @@ def log_agent_invocation(
         "duration_ms": duration_ms,
         "status": status,
     }
-    logger.info("STRUCTURED_LOG %s", json.dumps(entry))
+    if tool_durations_ms:
+        entry["tool_durations_ms"] = tool_durations_ms
+    if stages_ms:
+        entry["stages_ms"] = stages_ms
+    if concurrency:
+        entry.update(concurrency)
+    if upstream_pool:
+        entry["upstream_pool"] = upstream_pool
+    if prompt_cache:
+        entry["prompt_cache"] = prompt_cache
+    if memory_cache:
+        entry["memory_cache"] = memory_cache
+    _emf_aggregator.record_invocation(tenant_id, duration_ms, status)
+    emit_structured(entry)
 
 
 def log_permission_denied(
@@ -71,7 +636,8 @@ def log_permission_denied(
     tool_name: str,
     cedar_decision: str,
     request_id: Optional[str] = None,
-) -> None:
+    always_log: bool = False,
+) -> bool:
     """
     Log an audit entry when a tool call is denied by the permission system.
 
@@ -87,8 +653,15 @@ def log_permission_denied(
     - event_type   = "permission_denied"
     - log_stream   = "tenant_{tenant_id}"
 
+    Repeated denials are rate limited per tenant and tool (see
+    admit_denial_log); pass *always_log* for ALWAYS_BLOCKED_TOOLS. Returns
+    True if the entry was written in full.
+
     Requirements: 8.2, 8.4
     """
+    record_permission_denial(tenant_id, tool_name, cedar_decision)
+    if not admit_denial_log(tenant_id, tool_name, always_log):
+        return False
     entry = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "log_stream": f"tenant_{tenant_id}",
@@ -98,7 +671,8 @@ def log_permission_denied(
         "cedar_decision": cedar_decision,
         "request_id": request_id,
     }
-    logger.warning("STRUCTURED_LOG %s", json.dumps(entry))
+    emit_structured(entry, level=logging.WARNING)
+    return True
 
 
 def log_approval_decision(
@@ -118,6 +692,7 @@ def log_approval_decision(
     - resource
     - decision
     - approver_note
+    - requested_at  (so approval turnaround can be computed from one record)
     - timestamp
     - event_type  = "approval_decision"
     - log_stream  = "auth-agent"
@@ -133,5 +708,6 @@ def log_approval_decision(
         "resource": request.resource,
         "decision": decision,
         "approver_note": approver_note,
+        "requested_at": request.requested_at.isoformat(),
     }
-    logger.info("STRUCTURED_LOG %s", json.dumps(entry))
+    emit_structured(entry)
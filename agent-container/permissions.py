@@ -3,17 +3,28 @@ Permission profile management.
 
 Reads/writes per-tenant permission profiles from SSM Parameter Store.
 Profiles are injected into openclaw's system prompt (Plan A enforcement).
+Reads go through an in-process TTL cache; writes invalidate it.
 """
+import copy
 import json
 import logging
 import os
 import sys
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from uuid import uuid4
 
-import boto3
-from botocore.exceptions import ClientError
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import aws_clients  # noqa: E402
+import metrics  # noqa: E402
+from observability import (  # noqa: E402
+    admit_denial_log,
+    emit_structured,
+    record_permission_denial,
+)
+from tracing import start_span  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -47,47 +58,328 @@ class PermissionDeniedError(Exception):
 
 
 def _ssm_client():
-    return boto3.client("ssm", region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    return aws_clients.get_client("ssm")
 
 
 def _permissions_ssm_path(tenant_id: str) -> str:
     return f"/openclaw/{STACK_NAME}/tenants/{tenant_id}/permissions"
 
 
-def read_permission_profile(tenant_id: str) -> dict:
-    """Read tenant's Permission_Profile from SSM. Falls back to basic."""
+# Process-wide profile cache. A TTL of 0 disables caching.
+PROFILE_CACHE_TTL = float(os.environ.get("PROFILE_CACHE_TTL_SECONDS", "60"))
+# How long a ParameterNotFound result (tenant on the default profile) is cached.
+PROFILE_NEGATIVE_CACHE_TTL = float(os.environ.get("PROFILE_NEGATIVE_CACHE_TTL_SECONDS", "30"))
+# Interval of the background refresher that re-checks SSM parameter versions.
+PROFILE_REFRESH_INTERVAL = float(os.environ.get("PROFILE_REFRESH_INTERVAL_SECONDS", "30"))
+
+
+class _InFlightLoad:
+    """A single SSM load that concurrent callers for the same tenant wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.profile: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class _ProfileCache:
+    """
+    TTL cache for permission profiles with negative caching and single-flight
+    loading: concurrent misses for one tenant trigger exactly one SSM call.
+
+    Entries are stored as private copies and handed out as deep copies, so
+    callers may mutate what they receive (e.g. approval_executor appends to
+    ``tools`` before writing back).
+
+    Each entry also records the SSM parameter version it was loaded from
+    (None for a negative entry) so the background refresher can tell which
+    tenants actually changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, dict, Optional[int]]] = {}
+        self._loading: Dict[str, _InFlightLoad] = {}
+        # Invalidation bookkeeping: a load that started at generation g may only
+        # fill the cache if its tenant was not invalidated after g.
+        self._generation = 0
+        self._cleared_at = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def get(self, tenant_id: str, loader: Callable[[str], Tuple[dict, Optional[int]]]) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(tenant_id)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+            flight = self._loading.get(tenant_id)
+            leader = flight is None
+            if leader:
+                flight = _InFlightLoad()
+                self._loading[tenant_id] = flight
+                self.loads += 1
+            generation = self._generation
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.profile)
+
+        try:
+            profile, version = loader(tenant_id)
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.profile = profile
+            self.put(tenant_id, profile, version, generation)
+            return copy.deepcopy(profile)
+        finally:
+            with self._lock:
+                self._loading.pop(tenant_id, None)
+            flight.done.set()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, tenant_id: str, profile: dict, version: Optional[int], generation: int) -> None:
+        """Store *profile* unless the cache was invalidated since *generation*."""
+        ttl = PROFILE_CACHE_TTL if version is not None else min(
+            PROFILE_CACHE_TTL, PROFILE_NEGATIVE_CACHE_TTL
+        )
+        with self._lock:
+            stale = max(self._cleared_at, self._invalidated_at.get(tenant_id, 0)) > generation
+            if ttl > 0 and not stale:
+                self._entries[tenant_id] = (time.monotonic() + ttl, copy.deepcopy(profile), version)
+
+    def versions(self) -> Dict[str, Optional[int]]:
+        """Return the cached SSM version per tenant (expired entries included)."""
+        with self._lock:
+            return {tenant_id: entry[2] for tenant_id, entry in self._entries.items()}
+
+    def touch(self, tenant_ids) -> None:
+        """Extend the TTL of positive entries confirmed unchanged in SSM."""
+        expires = time.monotonic() + PROFILE_CACHE_TTL
+        with self._lock:
+            for tenant_id in tenant_ids:
+                entry = self._entries.get(tenant_id)
+                if entry is not None and entry[2] is not None:
+                    self._entries[tenant_id] = (expires, entry[1], entry[2])
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if tenant_id is None:
+                self._cleared_at = self._generation
+                self._invalidated_at.clear()
+                self._entries.clear()
+            else:
+                self._invalidated_at[tenant_id] = self._generation
+                self._entries.pop(tenant_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ssm_loads": self.loads,
+            }
+
+
+_profile_cache = _ProfileCache()
+
+metrics.register_callback(
+    "openclaw_profile_cache_hits_total", "Permission profile cache hits.",
+    lambda: _profile_cache.hits, type_name="counter",
+)
+metrics.register_callback(
+    "openclaw_profile_cache_misses_total", "Permission profile cache misses.",
+    lambda: _profile_cache.misses, type_name="counter",
+)
+
+
+def _load_permission_profile(tenant_id: str) -> Tuple[dict, Optional[int]]:
+    """Fetch a profile from SSM. Returns (profile, version); version is None if absent."""
+    from botocore.exceptions import ClientError
+
     ssm = _ssm_client()
     path = _permissions_ssm_path(tenant_id)
     try:
+        metrics.SSM_CALLS.labels("GetParameter").inc()
         response = ssm.get_parameter(Name=path)
-        return json.loads(response["Parameter"]["Value"])
+        return json.loads(response["Parameter"]["Value"]), response["Parameter"].get("Version", 0)
     except ssm.exceptions.ParameterNotFound:
-        return dict(DEFAULT_PROFILE)
+        return dict(DEFAULT_PROFILE), None
     except ClientError as e:
         logger.error("SSM read failed tenant_id=%s error=%s", tenant_id, e)
         raise
 
 
+def read_permission_profile(tenant_id: str) -> dict:
+    """Read tenant's Permission_Profile (cached, see PROFILE_CACHE_TTL). Falls back to basic."""
+    return _profile_cache.get(tenant_id, _load_permission_profile)
+
+
+def invalidate_permission_profile(tenant_id: Optional[str] = None) -> None:
+    """Drop the cached profile for *tenant_id*, or every cached profile if None."""
+    _profile_cache.invalidate(tenant_id)
+
+
+def profile_cache_stats() -> dict:
+    """Return hit/miss/load counters for the profile cache."""
+    return _profile_cache.stats()
+
+
 def write_permission_profile(tenant_id: str, profile: dict) -> None:
-    """Write tenant's Permission_Profile to SSM."""
+    """Write tenant's Permission_Profile to SSM and invalidate the cached copy."""
+    ssm = _ssm_client()
+    try:
+        metrics.SSM_CALLS.labels("PutParameter").inc()
+        ssm.put_parameter(
+            Name=_permissions_ssm_path(tenant_id),
+            Value=json.dumps(profile),
+            Type="String",
+            Overwrite=True,
+        )
+    finally:
+        invalidate_permission_profile(tenant_id)
+
+
+# ---------------------------------------------------------------------------
+# Bulk warm-up and background refresh
+# ---------------------------------------------------------------------------
+
+_TENANTS_PREFIX = f"/openclaw/{STACK_NAME}/tenants/"
+_PERMISSIONS_SUFFIX = "/permissions"
+_GET_PARAMETERS_BATCH = 10  # SSM GetParameters limit
+
+
+def _tenant_from_parameter_name(name: str) -> Optional[str]:
+    if not (name.startswith(_TENANTS_PREFIX) and name.endswith(_PERMISSIONS_SUFFIX)):
+        return None
+    tenant_id = name[len(_TENANTS_PREFIX):-len(_PERMISSIONS_SUFFIX)]
+    return tenant_id if tenant_id and "/" not in tenant_id else None
+
+
+def _cache_parameter(parameter: dict, generation: int) -> bool:
+    tenant_id = _tenant_from_parameter_name(parameter["Name"])
+    if tenant_id is None:
+        return False
+    try:
+        profile = json.loads(parameter["Value"])
+    except ValueError:
+        logger.warning("Skipping malformed profile parameter name=%s", parameter["Name"])
+        return False
+    _profile_cache.put(tenant_id, profile, parameter.get("Version", 0), generation)
+    return True
+
+
+def warm_profile_cache() -> int:
+    """
+    Load every tenant profile under the stack's tenant prefix into the cache.
+
+    Pages through GetParametersByPath so a cold container fills the cache with
+    a handful of calls instead of one GetParameter per tenant on the request
+    path. Returns the number of profiles cached.
+    """
+    generation = _profile_cache.generation
+    paginator = _ssm_client().get_paginator("get_parameters_by_path")
+    loaded = 0
+    for page in paginator.paginate(Path=_TENANTS_PREFIX, Recursive=True):
+        metrics.SSM_CALLS.labels("GetParametersByPath").inc()
+        for parameter in page.get("Parameters", []):
+            loaded += _cache_parameter(parameter, generation)
+    logger.info("Permission profile cache warmed profiles=%d", loaded)
+    return loaded
+
+
+def refresh_profile_cache() -> int:
+    """
+    Reload only the tenant profiles whose SSM version changed.
+
+    DescribeParameters lists names and versions without values; unchanged
+    entries have their TTL extended, changed or new ones are fetched with
+    batched GetParameters, and deleted ones are invalidated. Returns the
+    number of profiles reloaded.
+    """
     ssm = _ssm_client()
-    ssm.put_parameter(
-        Name=_permissions_ssm_path(tenant_id),
-        Value=json.dumps(profile),
-        Type="String",
-        Overwrite=True,
-    )
+    generation = _profile_cache.generation
+    cached = _profile_cache.versions()
+    current: Dict[str, int] = {}
+    paginator = ssm.get_paginator("describe_parameters")
+    for page in paginator.paginate(ParameterFilters=[
+        {"Key": "Path", "Option": "Recursive", "Values": [_TENANTS_PREFIX.rstrip("/")]},
+    ]):
+        metrics.SSM_CALLS.labels("DescribeParameters").inc()
+        for meta in page.get("Parameters", []):
+            tenant_id = _tenant_from_parameter_name(meta["Name"])
+            if tenant_id is not None:
+                current[tenant_id] = meta.get("Version", 0)
+
+    unchanged = [t for t, v in current.items() if cached.get(t) == v]
+    changed = [t for t, v in current.items() if cached.get(t) != v]
+    _profile_cache.touch(unchanged)
+    for tenant_id, version in cached.items():
+        if version is not None and tenant_id not in current:
+            _profile_cache.invalidate(tenant_id)
+
+    reloaded = 0
+    for i in range(0, len(changed), _GET_PARAMETERS_BATCH):
+        names = [_permissions_ssm_path(t) for t in changed[i:i + _GET_PARAMETERS_BATCH]]
+        metrics.SSM_CALLS.labels("GetParameters").inc()
+        response = ssm.get_parameters(Names=names)
+        for parameter in response.get("Parameters", []):
+            reloaded += _cache_parameter(parameter, generation)
+    if reloaded:
+        logger.info("Permission profile cache refreshed reloaded=%d", reloaded)
+    return reloaded
+
+
+def start_profile_refresher(interval: float = PROFILE_REFRESH_INTERVAL) -> Optional[threading.Thread]:
+    """
+    Warm the profile cache in a daemon thread, then keep it fresh every
+    *interval* seconds. Returns None when caching or refreshing is disabled.
+    """
+    if PROFILE_CACHE_TTL <= 0 or interval <= 0:
+        return None
+
+    def _run():
+        try:
+            warm_profile_cache()
+        except Exception as e:
+            logger.warning("Permission profile warm-up failed error=%s", e)
+        while True:
+            time.sleep(interval)
+            try:
+                refresh_profile_cache()
+            except Exception as e:
+                logger.warning("Permission profile refresh failed error=%s", e)
+
+    thread = threading.Thread(target=_run, name="profile-refresher", daemon=True)
+    thread.start()
+    return thread
 
 
 def _log_permission_denied(tenant_id: str, tool_name: str, resource: Optional[str]) -> None:
-    logger.warning("AUDIT %s", json.dumps({
+    record_permission_denial(tenant_id, tool_name, "CHECK")
+    if not admit_denial_log(tenant_id, tool_name, always_log=tool_name in ALWAYS_BLOCKED_TOOLS):
+        return
+    emit_structured({
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "log_stream": f"tenant_{tenant_id}",
         "tenant_id": tenant_id,
         "event_type": "permission_denied",
         "tool_name": tool_name,
         "resource": resource,
-    }))
+    }, level=logging.WARNING, prefix="AUDIT", target=logger)
 
 
 def check_tool_permission(
@@ -138,10 +430,7 @@ except ImportError:
 
 
 def _agentcore_client():
-    return boto3.client(
-        "bedrock-agentcore-runtime",
-        region_name=os.environ.get("AWS_REGION", "us-east-1"),
-    )
+    return aws_clients.get_client("bedrock-agentcore-runtime")
 
 
 def send_permission_request(
@@ -152,46 +441,57 @@ def send_permission_request(
     duration_type: str = "temporary",
     suggested_duration_hours: Optional[int] = 1,
 ):
-    """Send a PermissionRequest to the Authorization Agent."""
-    now = datetime.now(timezone.utc)
-    request = PermissionRequest(
-        request_id=str(uuid4()),
-        tenant_id=tenant_id,
-        resource_type="tool",
-        resource=resource or tool_name,
-        reason=reason,
-        duration_type=duration_type,
-        suggested_duration_hours=suggested_duration_hours,
-        requested_at=now,
-        expires_at=now + timedelta(minutes=30),
-        status="pending",
-    )
-
-    session_id = f"auth-agent-{STACK_NAME}"
-    payload = {
-        "request_id": request.request_id,
-        "tenant_id": request.tenant_id,
-        "resource_type": request.resource_type,
-        "resource": request.resource,
-        "reason": request.reason,
-        "duration_type": request.duration_type,
-        "suggested_duration_hours": request.suggested_duration_hours,
-        "requested_at": request.requested_at.isoformat(),
-        "expires_at": request.expires_at.isoformat(),
-        "status": request.status,
-    }
-
-    try:
-        _agentcore_client().invoke_agent_runtime(
-            agentRuntimeId=AUTH_AGENT_RUNTIME_ID,
-            sessionId=session_id,
-            payload=json.dumps(payload),
-        )
-        logger.info(
-            "PermissionRequest sent request_id=%s tenant_id=%s session_id=%s",
-            request.request_id, tenant_id, session_id,
+    """
+    Send a PermissionRequest to the Authorization Agent.
+
+    Runs in its own span; the span's traceparent travels in the payload so
+    the Authorization Agent can continue the same trace.
+    """
+    with start_span("agentcore.send_permission_request", attributes={
+        "tenant_id": tenant_id, "resource": resource or tool_name,
+    }) as span:
+        now = datetime.now(timezone.utc)
+        request = PermissionRequest(
+            request_id=str(uuid4()),
+            tenant_id=tenant_id,
+            resource_type="tool",
+            resource=resource or tool_name,
+            reason=reason,
+            duration_type=duration_type,
+            suggested_duration_hours=suggested_duration_hours,
+            requested_at=now,
+            expires_at=now + timedelta(minutes=30),
+            status="pending",
+            traceparent=span.traceparent,
         )
-    except Exception as e:
-        logger.error("Failed to send PermissionRequest request_id=%s error=%s", request.request_id, e)
+
+        session_id = f"auth-agent-{STACK_NAME}"
+        payload = {
+            "request_id": request.request_id,
+            "tenant_id": request.tenant_id,
+            "resource_type": request.resource_type,
+            "resource": request.resource,
+            "reason": request.reason,
+            "duration_type": request.duration_type,
+            "suggested_duration_hours": request.suggested_duration_hours,
+            "requested_at": request.requested_at.isoformat(),
+            "expires_at": request.expires_at.isoformat(),
+            "status": request.status,
+            "traceparent": request.traceparent,
+        }
+
+        try:
+            _agentcore_client().invoke_agent_runtime(
+                agentRuntimeId=AUTH_AGENT_RUNTIME_ID,
+                sessionId=session_id,
+                payload=json.dumps(payload),
+            )
+            logger.info(
+                "PermissionRequest sent request_id=%s tenant_id=%s session_id=%s trace_id=%s",
+                request.request_id, tenant_id, session_id, span.trace_id,
+            )
+        except Exception as e:
+            span.set_attribute("error", type(e).__name__)
+            logger.error("Failed to send PermissionRequest request_id=%s error=%s", request.request_id, e)
 
     return request
@@ -4,30 +4,90 @@ Agent Container HTTP server.
 Wraps openclaw as a subprocess. For each /invocations request:
   A. Injects the tenant's allowed tools into the system prompt (soft enforcement).
   E. Audits the response for tool usage patterns (post-execution logging).
+
+Payloads with ``"stream": true`` are relayed as server-sent events while
+openclaw generates them; the audit runs incrementally on the stream.
 """
+import functools
 import json
 import logging
 import os
 import re
+import select
+import socket
 import subprocess
 import sys
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from http.server import BaseHTTPRequestHandler, HTTPServer
-
-import requests
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from permissions import read_permission_profile
-from observability import log_agent_invocation, log_permission_denied
+import startup_profile
+
+startup_profile.install()
+
+import requests
+import metrics
+import upstream
+from supervisor import OpenclawSupervisor
+from workers import OpenclawWorker, WorkerPool
+from permissions import ALWAYS_BLOCKED_TOOLS, read_permission_profile, start_profile_refresher
+from observability import (
+    StageTimer,
+    log_agent_invocation,
+    log_permission_denied,
+    start_emf_flusher,
+    start_log_pipeline,
+    stop_emf_flusher,
+    stop_log_pipeline,
+)
+from memory import (
+    MEMORY_RECALL_ENABLED,
+    MEMORY_RECALL_TIMEOUT,
+    collect_prefetched_memory,
+    memory_recall_stats,
+    MEMORY_WRITE_BEHIND,
+    prefetch_memory,
+    shutdown_memory_executor,
+    start_memory_spool,
+    stop_memory_spool,
+)
 from safety import validate_message
+from tracing import current_span, current_traceparent, start_span
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+startup_profile.mark("imports")
 logger = logging.getLogger(__name__)
 
-OPENCLAW_PORT = 18789
-OPENCLAW_URL = f"http://localhost:{OPENCLAW_PORT}"
-STARTUP_TIMEOUT = 30
+OPENCLAW_SESSIONS_DIR = "/tmp/openclaw/sessions"
+
+# Set in main(); the supervised openclaw workers that /invocations routes to.
+_workers: Optional[WorkerPool] = None
+
+# Number of /invocations handled concurrently. Connections beyond this wait in
+# the pool's queue instead of blocking the accept loop.
+SERVER_MAX_WORKERS = int(os.environ.get("SERVER_MAX_WORKERS", "16"))
+# Connections allowed to wait once every worker is busy; beyond this they
+# get a 503 at once.
+SERVER_MAX_QUEUE = int(os.environ.get("SERVER_MAX_QUEUE", str(4 * SERVER_MAX_WORKERS)))
+# /ping and /metrics run on their own small pool so health checks are never
+# stuck behind slow invocations. The accept loop waits at most
+# SERVER_PEEK_SECONDS for a request line to tell the two apart.
+SERVER_CONTROL_WORKERS = int(os.environ.get("SERVER_CONTROL_WORKERS", "2"))
+SERVER_PEEK_SECONDS = float(os.environ.get("SERVER_PEEK_SECONDS", "0.01"))
+
+_CONTROL_PREFIXES = (b"GET /ping", b"GET /metrics")
+_QUEUE_FULL_RESPONSE = (
+    b"HTTP/1.0 503 Service Unavailable\r\nContent-Type: application/json\r\n"
+    b"Content-Length: 27\r\nRetry-After: 1\r\n\r\n{\"error\": \"server is busy\"}"
+)
+
+# Add a Server-Timing header with the per-stage latency breakdown.
+SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "").lower() in ("1", "true", "yes")
 
 # Regex to detect tool invocation patterns in openclaw responses.
 # openclaw typically outputs tool calls as: [tool_name] or <tool:tool_name> or similar.
@@ -35,21 +95,46 @@ _TOOL_PATTERN = re.compile(
     r'\b(shell|browser|file_write|code_execution|install_skill|load_extension|eval)\b',
     re.IGNORECASE,
 )
-
-
-def _build_system_prompt(tenant_id: str) -> str:
-    """Plan A: build a system prompt that constrains openclaw to allowed tools."""
-    try:
-        profile = read_permission_profile(tenant_id)
-        allowed = profile.get("tools", ["web_search"])
-        blocked = [t for t in ["shell", "browser", "file", "file_write", "code_execution",
-                                "install_skill", "load_extension", "eval"]
-                   if t not in allowed]
-    except Exception:
-        allowed = ["web_search"]
-        blocked = ["shell", "browser", "file", "file_write", "code_execution",
-                   "install_skill", "load_extension", "eval"]
-
+# Case-sensitive twin of _TOOL_PATTERN for text that has already been
+# lowercased; noticeably faster than IGNORECASE matching on long content.
+_TOOL_PATTERN_LOWER = re.compile(_TOOL_PATTERN.pattern)
+
+
+# Tools named in the "MUST NOT use" clause when the profile does not allow them.
+_RESTRICTABLE_TOOLS = ["shell", "browser", "file", "file_write", "code_execution",
+                       "install_skill", "load_extension", "eval"]
+# Tools Plan E reports when a completion invokes them without permission.
+_AUDITED_TOOLS = frozenset(_RESTRICTABLE_TOOLS) | ALWAYS_BLOCKED_TOOLS
+
+# Built prompts keyed by the profile's tool list. Tenants with identical
+# profiles share one interned string, and the same profile always yields a
+# byte-identical prompt so Bedrock prompt caching sees a stable prefix.
+_PROMPT_CACHE_MAX = 1024
+_prompt_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+_prompt_cache_counters = {"hits": 0, "misses": 0}
+
+
+def _system_prompt_for_tools(allowed: tuple) -> str:
+    """Plan A: the system prompt constraining openclaw to *allowed*, interned per tool set."""
+    with _prompt_cache_lock:
+        prompt = _prompt_cache.get(allowed)
+        if prompt is not None:
+            _prompt_cache.move_to_end(allowed)
+            _prompt_cache_counters["hits"] += 1
+            return prompt
+        _prompt_cache_counters["misses"] += 1
+
+    prompt = _render_system_prompt(allowed)
+    with _prompt_cache_lock:
+        prompt = _prompt_cache.setdefault(allowed, prompt)
+        if len(_prompt_cache) > _PROMPT_CACHE_MAX:
+            _prompt_cache.popitem(last=False)
+    return prompt
+
+
+def _render_system_prompt(allowed: tuple) -> str:
+    blocked = [t for t in _RESTRICTABLE_TOOLS if t not in allowed]
     lines = [
         f"Allowed tools for this session: {', '.join(allowed)}.",
     ]
@@ -62,28 +147,200 @@ def _build_system_prompt(tenant_id: str) -> str:
     return " ".join(lines)
 
 
-def _audit_response(tenant_id: str, response_text: str, allowed_tools: list) -> None:
-    """Plan E: scan response for tool usage and log any violations."""
-    matches = _TOOL_PATTERN.findall(response_text)
-    if not matches:
-        return
-    for tool in set(t.lower() for t in matches):
+def prompt_cache_stats() -> dict:
+    """Return hit/miss counters and size of the system-prompt cache."""
+    with _prompt_cache_lock:
+        return {**_prompt_cache_counters, "size": len(_prompt_cache)}
+
+
+_MEMORY_CONTEXT_HEADER = "Summaries of this user's earlier sessions:\n"
+
+
+def _message_text(content) -> str:
+    """Return the text of an OpenAI message ``content`` (string or list of parts)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            part.get("text", "") for part in content
+            if isinstance(part, dict) and isinstance(part.get("text"), str)
+        )
+    return ""
+
+
+@dataclass
+class _ToolUsage:
+    """Tools found in one completion by _collect_response_tools."""
+
+    invoked: List[str] = field(default_factory=list)  # real tool calls, in call order
+    mentioned: Set[str] = field(default_factory=set)  # text matches, only if nothing invoked
+    durations_ms: Dict[str, int] = field(default_factory=dict)  # per tool, when reported
+
+    def audited(self) -> set:
+        """
+        The tool set Plan E checks against the allowlist. Invoked tools are
+        limited to the restrictable and always-blocked ones, so ordinary
+        openclaw tools (web_fetch, memory_search, ...) are not reported.
+        """
+        if self.invoked:
+            return {tool for tool in self.invoked if tool in _AUDITED_TOOLS}
+        return self.mentioned
+
+
+def _collect_response_tools(result: dict) -> _ToolUsage:
+    """
+    Walk an OpenAI-shaped completion once.
+
+    Collects the function names of real ``tool_calls`` (and legacy
+    ``function_call``) entries, summing any ``duration_ms`` openclaw attaches
+    to a call. Message content is scanned with _TOOL_PATTERN only when the
+    completion contains no tool calls.
+    """
+    usage = _ToolUsage()
+    texts: List[str] = []
+    choices = result.get("choices") if isinstance(result, dict) else None
+    for choice in choices or []:
+        message = choice.get("message") or choice.get("delta") or {}
+        calls = list(message.get("tool_calls") or [])
+        legacy = message.get("function_call")
+        if isinstance(legacy, dict):
+            calls.append({"function": legacy, "duration_ms": legacy.get("duration_ms")})
+        for call in calls:
+            name = (call.get("function") or {}).get("name")
+            if not name:
+                continue
+            name = name.lower()
+            usage.invoked.append(name)
+            duration = call.get("duration_ms")
+            if isinstance(duration, (int, float)):
+                usage.durations_ms[name] = usage.durations_ms.get(name, 0) + int(duration)
+        text = _message_text(message.get("content"))
+        if text:
+            texts.append(text)
+    if not usage.invoked:
+        for text in texts:
+            usage.mentioned.update(_TOOL_PATTERN_LOWER.findall(text.lower()))
+    return usage
+
+
+def _audit_response(tenant_id: str, result: dict, allowed_tools: list) -> _ToolUsage:
+    """
+    Plan E: audit a completion for tool usage and log any violations.
+
+    Real ``tool_calls`` entries are authoritative. Only when the response
+    carries none does the audit fall back to scanning message content for
+    tool names. Returns the collected usage for invocation logging.
+    """
+    usage = _collect_response_tools(result)
+    _report_audited_tools(tenant_id, usage.audited(), allowed_tools)
+    return usage
+
+
+def _report_audited_tools(tenant_id: str, tools: set, allowed_tools: list) -> None:
+    for tool in tools:
         if tool not in allowed_tools:
-            log_permission_denied(
+            logged = log_permission_denied(
                 tenant_id=tenant_id,
                 tool_name=tool,
                 cedar_decision="RESPONSE_AUDIT",
                 request_id=None,
+                always_log=tool in ALWAYS_BLOCKED_TOOLS,
             )
+            if not logged:
+                continue
             logger.warning(
                 "AUDIT: blocked tool '%s' detected in response tenant_id=%s",
                 tool, tenant_id,
             )
 
 
-def start_openclaw() -> subprocess.Popen:
+class _StreamAuditor:
+    """
+    Plan E for streamed completions: scans SSE chunks as they are relayed.
+
+    Function names from ``tool_calls`` deltas are collected directly. Content
+    deltas are matched against _TOOL_PATTERN as they arrive, carrying a
+    trailing word fragment over to the next chunk so tool names split across
+    deltas are still detected. As in _audit_response, text matches are only
+    used when the stream contained no real tool calls.
+    """
+
+    _TRAILING_WORD = re.compile(r"\w*$")
+
+    def __init__(self):
+        self.usage = _ToolUsage()
+        self._pending = b""
+        self._tail = ""
+
+    def feed(self, chunk: bytes) -> None:
+        self._pending += chunk
+        *lines, self._pending = self._pending.split(b"\n")
+        for line in lines:
+            self._feed_line(line.strip())
+
+    def close(self) -> _ToolUsage:
+        """Flush buffered input and return the collected tool usage."""
+        self._feed_line(self._pending.strip())
+        self._pending = b""
+        self._scan_text("", final=True)
+        if self.usage.invoked:
+            self.usage.mentioned.clear()
+        return self.usage
+
+    def _feed_line(self, line: bytes) -> None:
+        if not line.startswith(b"data:"):
+            return
+        data = line[5:].strip()
+        if not data or data == b"[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+        # Frames of an unexpected shape are skipped: auditing must never
+        # break the relay.
+        choices = event.get("choices") if isinstance(event, dict) else None
+        for choice in choices if isinstance(choices, list) else []:
+            delta = choice.get("delta") if isinstance(choice, dict) else None
+            if not isinstance(delta, dict):
+                continue
+            content = delta.get("content")
+            if isinstance(content, str):
+                self._scan_text(content)
+            calls = delta.get("tool_calls")
+            for call in calls if isinstance(calls, list) else []:
+                function = call.get("function") if isinstance(call, dict) else None
+                name = function.get("name") if isinstance(function, dict) else None
+                if isinstance(name, str) and name:
+                    self.usage.invoked.append(name.lower())
+
+    def _scan_text(self, text: str, final: bool = False) -> None:
+        text = self._tail + text
+        cut = len(text) if final else self._TRAILING_WORD.search(text).start()
+        self.usage.mentioned.update(_TOOL_PATTERN_LOWER.findall(text[:cut].lower()))
+        self._tail = text[cut:]
+
+
+def _allowed_tools(tenant_id: str) -> list:
+    try:
+        profile = read_permission_profile(tenant_id)
+        return profile.get("tools", ["web_search"])
+    except Exception:
+        return ["web_search"]
+
+
+def _worker_session_dir(index: int) -> str:
+    return OPENCLAW_SESSIONS_DIR if index == 0 else f"{OPENCLAW_SESSIONS_DIR}-{index}"
+
+
+def start_openclaw(
+    port: int = upstream.OPENCLAW_PORT,
+    session_dir: str = OPENCLAW_SESSIONS_DIR,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> subprocess.Popen:
+    """Launch openclaw; each output line is logged and passed to *on_line*."""
     config_src = "/app/openclaw.json"
-    config_dst = "/tmp/openclaw_runtime.json"
+    config_dst = "/tmp/openclaw_runtime.json" if port == upstream.OPENCLAW_PORT else f"/tmp/openclaw_runtime_{port}.json"
     with open(config_src) as f:
         config_str = f.read()
     config_str = config_str.replace("${AWS_REGION}", os.environ.get("AWS_REGION", "us-east-1"))
@@ -91,8 +348,12 @@ def start_openclaw() -> subprocess.Popen:
         "${BEDROCK_MODEL_ID}",
         os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-3-5-sonnet-20241022-v2:0"),
     )
+    config = json.loads(config_str)
+    config["gateway"]["http"]["port"] = port
+    config["sessions"]["dir"] = session_dir
+    os.makedirs(session_dir, exist_ok=True)
     with open(config_dst, "w") as f:
-        f.write(config_str)
+        json.dump(config, f)
 
     env = os.environ.copy()
     env["OPENCLAW_SKIP_ONBOARDING"] = "1"
@@ -102,39 +363,156 @@ def start_openclaw() -> subprocess.Popen:
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
     )
-    threading.Thread(
-        target=lambda: [logger.info("[openclaw] %s", l.decode().rstrip()) for l in proc.stdout],
-        daemon=True,
-    ).start()
+    threading.Thread(target=_read_openclaw_output, args=(proc, on_line), daemon=True).start()
     return proc
 
 
-def wait_for_openclaw(timeout: int = STARTUP_TIMEOUT) -> None:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+def _read_openclaw_output(proc: subprocess.Popen, on_line: Optional[Callable[[str], None]]) -> None:
+    for raw in proc.stdout:
+        line = raw.decode(errors="replace").rstrip()
+        logger.info("[openclaw] %s", line)
+        if on_line is not None:
+            on_line(line)
+
+
+def openclaw_alive(base_url: str = upstream.OPENCLAW_URL) -> bool:
+    """
+    Readiness and liveness probe: any HTTP response means the gateway is
+    listening and its event loop is serving. Cheaper than a chat-completions
+    call and never reaches the model.
+    """
+    try:
+        r = upstream.get("/", base_url=base_url)
+    except requests.exceptions.RequestException:
+        return False
+    return r.status_code < 500
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer that hands each accepted connection to a bounded thread pool.
+
+    The accept loop never blocks on a slow openclaw call. /ping and /metrics
+    go to a separate control pool, so health checks are answered even when
+    every invocation worker is busy. At most *max_queue* connections wait once
+    every invocation worker is busy (0: none wait); further ones are answered
+    503 from the accept loop.
+    In-flight, queued and rejected counts are tracked so containers can be
+    sized by measured concurrency.
+    """
+
+    def __init__(
+        self, server_address, handler_class,
+        max_workers: int = SERVER_MAX_WORKERS, max_queue: int = SERVER_MAX_QUEUE,
+    ):
+        super().__init__(server_address, handler_class)
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="invocation",
+        )
+        self._control_executor = ThreadPoolExecutor(
+            max_workers=max(1, SERVER_CONTROL_WORKERS), thread_name_prefix="control",
+        )
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._queued = 0
+        self._rejected = 0
+
+    def process_request(self, request, client_address):
+        if self._is_control_request(request):
+            self._control_executor.submit(self._process_control_request, request, client_address)
+            return
+        with self._stats_lock:
+            # Connections submitted but not yet picked up count as waiting
+            # only beyond the workers that are free to take them.
+            full = self._in_flight + self._queued >= self.max_workers + self.max_queue
+            if full:
+                self._rejected += 1
+            else:
+                self._queued += 1
+        if full:
+            self._reject(request)
+            return
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    @staticmethod
+    def _is_control_request(request) -> bool:
+        """Peek at the request line without consuming it (one request per connection)."""
         try:
-            r = requests.post(
-                f"{OPENCLAW_URL}/v1/chat/completions",
-                json={"model": "probe", "messages": [], "user": "healthcheck"},
-                timeout=2,
-            )
-            if r.status_code < 500:
-                logger.info("openclaw ready (status=%d)", r.status_code)
-                return
-        except requests.exceptions.ConnectionError:
+            ready, _, _ = select.select([request], [], [], SERVER_PEEK_SECONDS)
+            if not ready:
+                return False
+            head = request.recv(16, socket.MSG_PEEK)
+        except OSError:
+            return False
+        return head.startswith(_CONTROL_PREFIXES)
+
+    def _reject(self, request) -> None:
+        try:
+            request.sendall(_QUEUE_FULL_RESPONSE)
+        except OSError:
             pass
-        time.sleep(1)
-    logger.error("openclaw did not become ready within %d seconds", timeout)
-    sys.exit(1)
+        self.shutdown_request(request)
+
+    def _process_control_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def _process_request_worker(self, request, client_address):
+        with self._stats_lock:
+            self._queued -= 1
+            self._in_flight += 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._stats_lock:
+                self._in_flight -= 1
+
+    def concurrency_stats(self) -> dict:
+        """Return a snapshot of in-flight, queued and rejected request counts."""
+        with self._stats_lock:
+            return {
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "rejected": self._rejected,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+            }
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._control_executor.shutdown(wait=False, cancel_futures=True)
 
 
 class AgentCoreHandler(BaseHTTPRequestHandler):
+    # Headers and body go out in separate writes; don't let Nagle hold the body.
+    disable_nagle_algorithm = True
+
     def log_message(self, format, *args):  # noqa: A002
         logger.info(format, *args)
 
+    def _concurrency_stats(self) -> dict:
+        stats = getattr(self.server, "concurrency_stats", None)
+        return stats() if stats else {}
+
     def do_GET(self):
         if self.path == "/ping":
-            self._respond(200, {"status": "ok"})
+            ready = _workers is None or _workers.is_ready()
+            body = {"status": "ready" if ready else "starting", **self._concurrency_stats()}
+            if _workers is not None:
+                body["upstream"] = _workers.stats()
+            self._respond(200, body)
+        elif self.path == "/metrics":
+            self._send(200, metrics.render(), metrics.CONTENT_TYPE)
         else:
             self._respond(404, {"error": "not found"})
 
@@ -142,77 +520,293 @@ class AgentCoreHandler(BaseHTTPRequestHandler):
         if self.path != "/invocations":
             self._respond(404, {"error": "not found"})
             return
+        with start_span("agentcore.invocation", traceparent=self.headers.get("traceparent")):
+            self._handle_invocation()
 
-        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
-        try:
-            payload = json.loads(body)
-        except json.JSONDecodeError:
+    def _handle_invocation(self):
+        timer = StageTimer()
+        with timer.stage("read_parse"):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError:
+                payload = None
+        if payload is None:
             self._respond(400, {"error": "invalid json"})
             return
 
         tenant_id = payload.get("sessionId") or payload.get("tenant_id") or "unknown"
-        message = validate_message(payload.get("message", ""))
+        current_span().set_attribute("tenant_id", tenant_id)
+        with timer.stage("validate"):
+            message = validate_message(payload.get("message", ""))
         session_key = f"agentcore:{tenant_id}"
+        # Started now so the retrieve overlaps the profile fetch and prompt build.
+        recall = prefetch_memory(tenant_id) if MEMORY_RECALL_ENABLED else None
 
         # Plan A: inject permission constraints into system prompt
-        system_prompt = _build_system_prompt(tenant_id)
+        with timer.stage("profile_fetch"):
+            allowed = _allowed_tools(tenant_id)
+        with timer.stage("prompt_build"):
+            system_prompt = _system_prompt_for_tools(tuple(allowed))
+        messages = [{"role": "system", "content": system_prompt}]
+        if recall is not None:
+            with timer.stage("memory_recall"):
+                memory = collect_prefetched_memory(recall, MEMORY_RECALL_TIMEOUT, query=message)
+            current_span().set_attribute("memory_recalled", bool(memory))
+            if memory:
+                # A separate message keeps the cached system prompt a stable prefix.
+                messages.append({"role": "system", "content": _MEMORY_CONTEXT_HEADER + memory})
+        messages.append({"role": "user", "content": message})
 
         start_ms = int(time.time() * 1000)
+        stream = bool(payload.get("stream"))
+        request_body = {
+            "model": payload.get("model", "default"),
+            "messages": messages,
+            "user": session_key,
+        }
+        if stream:
+            request_body["stream"] = True
+        with timer.stage("upstream_wait"):
+            worker = _workers.acquire(session_key) if _workers is not None else None
+        if _workers is not None and worker is None:
+            duration_ms = int(time.time() * 1000) - start_ms
+            self._log_invocation(tenant_id, "unavailable", duration_ms, timer)
+            self._respond(503, {"error": "openclaw is restarting"})
+            return
+        if worker is not None:
+            current_span().set_attribute("upstream_worker", worker.index)
+        with _workers.track(worker) if worker is not None else nullcontext():
+            self._invoke_upstream(tenant_id, session_key, request_body, stream, worker, allowed, timer, start_ms)
+
+    def _invoke_upstream(
+        self, tenant_id: str, session_key: str, request_body: dict, stream: bool,
+        worker: Optional[OpenclawWorker], allowed: list, timer: StageTimer, start_ms: int,
+    ) -> None:
         try:
-            resp = requests.post(
-                f"{OPENCLAW_URL}/v1/chat/completions",
-                json={
-                    "model": payload.get("model", "default"),
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": message},
-                    ],
-                    "user": session_key,
-                },
-                timeout=300,
-            )
+            upstream_started = time.perf_counter()
+            resp = self._post_upstream(session_key, request_body, stream, worker)
+            timer.record("upstream_connect", upstream.last_connect_ms())
+            timer.record("upstream_ttfb", resp.elapsed.total_seconds() * 1000)
+            if stream and resp.headers.get("Content-Type", "").startswith("text/event-stream"):
+                self._relay_stream(tenant_id, resp, start_ms, allowed, timer, upstream_started)
+                return
             result = resp.json()
+            timer.record("upstream_total", (time.perf_counter() - upstream_started) * 1000)
             duration_ms = int(time.time() * 1000) - start_ms
 
             # Plan E: audit the response for tool usage
-            response_text = json.dumps(result)
-            try:
-                profile = read_permission_profile(tenant_id)
-                allowed = profile.get("tools", ["web_search"])
-            except Exception:
-                allowed = ["web_search"]
-            _audit_response(tenant_id, response_text, allowed)
+            with timer.stage("audit"):
+                usage = _audit_response(tenant_id, result, allowed)
 
-            log_agent_invocation(tenant_id=tenant_id, tools_used=[], duration_ms=duration_ms, status="success")
-            self._respond(200, result)
+            with timer.stage("serialize"):
+                data = json.dumps(result).encode()
+            self._log_invocation(tenant_id, "success", duration_ms, timer, usage)
+            self._send(200, data, "application/json", timer)
 
         except Exception as e:
             duration_ms = int(time.time() * 1000) - start_ms
-            log_agent_invocation(tenant_id=tenant_id, tools_used=[], duration_ms=duration_ms, status="error")
+            self._log_invocation(tenant_id, "error", duration_ms, timer)
             logger.error("openclaw invocation failed tenant_id=%s error=%s", tenant_id, e)
             self._respond(500, {"error": str(e)})
 
+    def _post_upstream(
+        self, session_key: str, request_body: dict, stream: bool, worker: Optional[OpenclawWorker],
+    ):
+        """
+        POST to openclaw, retrying once on another ready worker (or the same
+        one after its restart) if no connection could be opened — the request
+        never reached openclaw, so retrying is safe.
+        """
+        headers = {"traceparent": current_traceparent()}
+        base_url = worker.base_url if worker is not None else upstream.OPENCLAW_URL
+        try:
+            return upstream.post(
+                "/v1/chat/completions", json=request_body, stream=stream, headers=headers, base_url=base_url,
+            )
+        except requests.exceptions.ConnectionError as e:
+            if worker is None:
+                raise
+            worker.supervisor.report_failure()
+            if not upstream.is_connect_failure(e):
+                raise
+            retry = _workers.acquire(session_key, exclude=worker)
+            if retry is None:
+                raise
+            return upstream.post(
+                "/v1/chat/completions", json=request_body, stream=stream, headers=headers,
+                base_url=retry.base_url,
+            )
+
+    def _relay_stream(
+        self, tenant_id: str, resp, start_ms: int, allowed: list,
+        timer: StageTimer, upstream_started: float,
+    ) -> None:
+        """Forward openclaw's SSE chunks to the caller as they arrive."""
+        auditor = _StreamAuditor()
+        status = "success"
+        self.send_response(resp.status_code)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        if SERVER_TIMING_HEADER:
+            self.send_header("Server-Timing", timer.server_timing())
+        self.end_headers()
+        try:
+            for chunk in resp.iter_content(chunk_size=None):
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                with timer.stage("audit"):
+                    auditor.feed(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            status = "cancelled"
+            logger.info("client disconnected mid-stream tenant_id=%s", tenant_id)
+        except Exception as e:
+            status = "error"
+            logger.error("openclaw stream failed tenant_id=%s error=%s", tenant_id, e)
+        finally:
+            resp.close()
+            timer.record("upstream_total", (time.perf_counter() - upstream_started) * 1000)
+            duration_ms = int(time.time() * 1000) - start_ms
+            with timer.stage("audit"):
+                usage = auditor.close()
+                _report_audited_tools(tenant_id, usage.audited(), allowed)
+            self._log_invocation(tenant_id, status, duration_ms, timer, usage)
+
+    def _log_invocation(
+        self, tenant_id: str, status: str, duration_ms: int,
+        timer: StageTimer, usage: Optional[_ToolUsage] = None,
+    ) -> None:
+        usage = usage or _ToolUsage()
+        stages = timer.as_dict()
+        span = current_span()
+        if span is not None:
+            span.set_attribute("status", status)
+            span.set_attribute("stages_ms", stages)
+        metrics.INVOCATIONS.labels(status).inc()
+        if "upstream_total" in stages:
+            metrics.UPSTREAM_LATENCY.observe(stages["upstream_total"] / 1000)
+        log_agent_invocation(
+            tenant_id=tenant_id, tools_used=usage.invoked, duration_ms=duration_ms,
+            status=status, tool_durations_ms=usage.durations_ms,
+            stages_ms=stages,
+            concurrency=self._concurrency_stats(),
+            upstream_pool=upstream.pool_stats(),
+            prompt_cache=prompt_cache_stats(),
+            memory_cache=memory_recall_stats() if MEMORY_RECALL_ENABLED else None,
+        )
+
     def _respond(self, status: int, body: dict):
-        data = json.dumps(body).encode()
+        self._send(status, json.dumps(body).encode(), "application/json")
+
+    def _send(self, status: int, data: bytes, content_type: str, timer: Optional[StageTimer] = None):
         self.send_response(status)
-        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(data)))
+        if timer is not None and SERVER_TIMING_HEADER:
+            self.send_header("Server-Timing", timer.server_timing())
         self.end_headers()
         self.wfile.write(data)
 
 
+def _per_worker(value: Callable[[OpenclawWorker], float]) -> Callable[[], dict]:
+    return lambda: {(str(w.index),): value(w) for w in _workers.workers}
+
+
+def _register_worker_metrics() -> None:
+    metrics.register_callback(
+        "openclaw_upstream_restarts_total", "openclaw subprocess restarts by the supervisor.",
+        _per_worker(lambda w: w.supervisor.stats()["restarts"]), ["worker"], type_name="counter",
+    )
+    metrics.register_callback(
+        "openclaw_upstream_ready", "1 when the openclaw worker is ready to serve requests.",
+        _per_worker(lambda w: 1 if w.supervisor.is_ready() else 0), ["worker"],
+    )
+    metrics.register_callback(
+        "openclaw_upstream_time_to_ready_seconds", "Launch-to-ready time of the current openclaw process.",
+        _per_worker(lambda w: (w.supervisor.stats()["time_to_ready_ms"] or 0) / 1000), ["worker"],
+    )
+    metrics.register_callback(
+        "openclaw_startup_time_to_ready_seconds", "Launch-to-ready time of the first openclaw process (cold start).",
+        _per_worker(lambda w: (w.supervisor.stats()["initial_time_to_ready_ms"] or 0) / 1000), ["worker"],
+    )
+    metrics.register_callback(
+        "openclaw_upstream_in_flight", "Requests in flight per openclaw worker.",
+        _per_worker(lambda w: w.in_flight), ["worker"],
+    )
+    metrics.register_callback(
+        "openclaw_upstream_requests_total", "Requests routed to each openclaw worker.",
+        _per_worker(lambda w: w.requests), ["worker"], type_name="counter",
+    )
+
+
+def _make_supervisor(index: int, base_url: str, session_dir: str) -> OpenclawSupervisor:
+    port = upstream.OPENCLAW_PORT + index
+    return OpenclawSupervisor(
+        functools.partial(start_openclaw, port, session_dir),
+        functools.partial(openclaw_alive, base_url),
+    )
+
+
 def main():
-    proc = start_openclaw()
-    wait_for_openclaw(STARTUP_TIMEOUT)
+    global _workers
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    with startup_profile.phase("log_pipeline"):
+        start_log_pipeline()
+        start_emf_flusher()
+    count = upstream.OPENCLAW_WORKERS
+    with startup_profile.phase("openclaw_launch"):
+        _workers = WorkerPool(
+            [upstream.worker_url(i) for i in range(count)],
+            [_worker_session_dir(i) for i in range(count)],
+            _make_supervisor,
+        )
+        _workers.start()
+        _register_worker_metrics()
+    # Warm the permission profile cache while openclaw is still starting.
+    with startup_profile.phase("profile_refresher"):
+        start_profile_refresher()
+    if MEMORY_WRITE_BEHIND and "MEMORY_STORE_ID" in os.environ:
+        # Flushes summaries a previous run left in the spool.
+        with startup_profile.phase("memory_spool"):
+            start_memory_spool()
+    # Listen right away: /ping reports "starting" until a worker is ready and
+    # early invocations wait for it (see supervisor.REQUEST_WAIT_SECONDS).
     port = int(os.environ.get("PORT", 8080))
-    server = HTTPServer(("0.0.0.0", port), AgentCoreHandler)
-    logger.info("Python wrapper listening on port %d", port)
+    with startup_profile.phase("http_bind"):
+        server = PooledHTTPServer(("0.0.0.0", port), AgentCoreHandler, SERVER_MAX_WORKERS, SERVER_MAX_QUEUE)
+    metrics.register_callback(
+        "openclaw_requests_in_flight", "Requests currently being handled.",
+        lambda: server.concurrency_stats()["in_flight"],
+    )
+    metrics.register_callback(
+        "openclaw_requests_queued", "Accepted requests waiting for a worker thread.",
+        lambda: server.concurrency_stats()["queued"],
+    )
+    metrics.register_callback(
+        "openclaw_requests_rejected_total", "Requests answered 503 because the worker queue was full.",
+        lambda: server.concurrency_stats()["rejected"], type_name="counter",
+    )
+    metrics.register_callback(
+        "openclaw_prompt_cache_hits_total", "System-prompt cache hits.",
+        lambda: prompt_cache_stats()["hits"], type_name="counter",
+    )
+    logger.info(
+        "Python wrapper listening on port %d (max_workers=%d, openclaw_workers=%d)",
+        port, server.max_workers, count,
+    )
+    startup_profile.report("agent-container", logger)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
-        proc.terminate()
+        server.server_close()
+        upstream.close()
+        _workers.stop()
+        stop_memory_spool()
+        shutdown_memory_executor()
+        stop_emf_flusher()
+        stop_log_pipeline()
 
 
 if __name__ == "__main__":
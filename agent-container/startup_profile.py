@@ -0,0 +1,150 @@
+"""
+Cold-start profiler for the container entry points.
+
+Enabled with ``STARTUP_PROFILE=1``. Once install() is called, module imports
+are timed by a meta-path finder, and entry points wrap their init steps in
+phase(). report() then writes one ``startup_profile`` structured log entry
+with the phase durations and the slowest imports, similar to
+``python -X importtime`` but available in the deployed container.
+
+When the variable is unset, install() does nothing and phase() only yields,
+so the hooks cost nothing in normal runs.
+"""
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+STARTUP_PROFILE = os.environ.get("STARTUP_PROFILE", "").lower() in ("1", "true", "yes")
+
+# Imports listed in the report, slowest (cumulative) first.
+STARTUP_PROFILE_TOP_IMPORTS = int(os.environ.get("STARTUP_PROFILE_TOP_IMPORTS", "25"))
+
+_started = time.perf_counter()
+_lock = threading.Lock()
+_phases: Dict[str, float] = {}
+_imports: Dict[str, List[float]] = {}  # module -> [cumulative_ms, self_ms]
+_import_stack: List[List[float]] = []  # per nested import: [start, child_ms]
+_installed = False
+_last_mark = _started
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        frame = [time.perf_counter(), 0.0]
+        _import_stack.append(frame)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            _import_stack.pop()
+            total = (time.perf_counter() - frame[0]) * 1000
+            if _import_stack:
+                _import_stack[-1][1] += total
+            _imports[self._name] = [round(total, 2), round(total - frame[1], 2)]
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Wraps the loader of every module found by the other finders."""
+
+    def find_spec(self, fullname, path, target=None):
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+
+def install() -> None:
+    """Start timing imports (no-op unless STARTUP_PROFILE is set)."""
+    global _installed
+    if not STARTUP_PROFILE or _installed:
+        return
+    sys.meta_path.insert(0, _TimingFinder())
+    _installed = True
+
+
+def uninstall() -> None:
+    global _installed
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, _TimingFinder)]
+    _installed = False
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the duration of an init step under *name* when profiling."""
+    if not STARTUP_PROFILE:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _phases[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def mark(name: str) -> None:
+    """Record the time since the previous mark (or profiler import) as phase *name*."""
+    global _last_mark
+    if not STARTUP_PROFILE:
+        return
+    now = time.perf_counter()
+    with _lock:
+        _phases[name] = round((now - _last_mark) * 1000, 2)
+        _last_mark = now
+
+
+def snapshot(top: int = STARTUP_PROFILE_TOP_IMPORTS) -> dict:
+    """Phase and import timings collected so far."""
+    with _lock:
+        phases = dict(_phases)
+    slowest = sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {
+        "since_profiler_import_ms": round((time.perf_counter() - _started) * 1000, 2),
+        "phases_ms": phases,
+        "imports_ms": [
+            {"module": name, "cumulative_ms": cumulative, "self_ms": self_ms}
+            for name, (cumulative, self_ms) in slowest
+        ],
+        "modules_imported": len(_imports),
+    }
+
+
+def report(entry_point: str, target: Optional[logging.Logger] = None) -> Optional[dict]:
+    """Log the startup profile for *entry_point* once init is done, and stop timing imports."""
+    if not STARTUP_PROFILE:
+        return None
+    uninstall()
+    # Imported here so that importing this module first stays cheap.
+    from observability import emit_structured
+
+    profile = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "log_stream": entry_point,
+        "event_type": "startup_profile",
+        "entry_point": entry_point,
+        **snapshot(),
+    }
+    emit_structured(dict(profile), target=target, with_trace=False)
+    return profile
@@ -0,0 +1,308 @@
+"""
+Supervisor for the openclaw subprocess.
+
+Readiness after each launch is detected by combining openclaw's own log
+output (a line matching OPENCLAW_READY_LOG_PATTERN triggers an immediate
+probe) with a lightweight HTTP probe on exponentially spaced intervals, so
+the wrapper notices within milliseconds instead of on a fixed 1 s poll.
+
+Once ready, the process is watched for exit and probed periodically so a
+hung event loop is caught too. A dead or unresponsive openclaw is
+restarted with exponential backoff; requests that arrive meanwhile wait on
+wait_ready() for a bounded time instead of failing with connection errors.
+
+Restart counts, the last exit code and time-to-ready are exposed through
+stats() for /ping and the metrics endpoint.
+"""
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from observability import emit_structured
+
+logger = logging.getLogger(__name__)
+
+# Liveness probing while openclaw is up: interval, and consecutive failed
+# probes before the process is considered hung and restarted.
+HEALTH_INTERVAL = float(os.environ.get("OPENCLAW_HEALTH_INTERVAL_SECONDS", "5"))
+HEALTH_FAILURES = int(os.environ.get("OPENCLAW_HEALTH_FAILURES", "3"))
+
+# Restart backoff: first delay, cap, and how long openclaw must stay up
+# before the delay resets to the first value.
+RESTART_BACKOFF_BASE = float(os.environ.get("OPENCLAW_RESTART_BACKOFF_SECONDS", "0.5"))
+RESTART_BACKOFF_MAX = float(os.environ.get("OPENCLAW_RESTART_BACKOFF_MAX_SECONDS", "30"))
+RESTART_STABLE_SECONDS = float(os.environ.get("OPENCLAW_RESTART_STABLE_SECONDS", "60"))
+
+# Time a launched process gets to become ready. Probes start
+# READY_PROBE_INITIAL seconds apart and double up to READY_PROBE_MAX.
+READY_TIMEOUT = float(os.environ.get("OPENCLAW_READY_TIMEOUT_SECONDS", "30"))
+READY_PROBE_INITIAL = float(os.environ.get("OPENCLAW_READY_PROBE_INITIAL_SECONDS", "0.025"))
+READY_PROBE_MAX = float(os.environ.get("OPENCLAW_READY_PROBE_MAX_SECONDS", "1"))
+
+# openclaw output lines that suggest the gateway is listening; a match
+# probes right away instead of waiting for the next interval.
+READY_LOG_PATTERN = re.compile(
+    os.environ.get("OPENCLAW_READY_LOG_PATTERN", r"\b(listening|ready|started)\b"), re.IGNORECASE,
+)
+
+# How long an invocation waits for openclaw during a restart before failing.
+REQUEST_WAIT_SECONDS = float(os.environ.get("OPENCLAW_REQUEST_WAIT_SECONDS", "20"))
+
+_TERMINATE_GRACE_SECONDS = 5
+
+
+class OpenclawSupervisor:
+    """
+    Keeps one openclaw process running.
+
+    *launch* starts a new process and calls its ``on_line`` argument with
+    each line of openclaw output; *ready_probe* returns True once it can
+    serve requests; *liveness_probe* (default: *ready_probe*) is the check
+    used while it is running.
+    """
+
+    def __init__(
+        self,
+        launch: Callable[..., subprocess.Popen],
+        ready_probe: Callable[[], bool],
+        liveness_probe: Optional[Callable[[], bool]] = None,
+    ):
+        self._launch = launch
+        self._ready_probe = ready_probe
+        self._liveness_probe = liveness_probe or ready_probe
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._log_hint = threading.Event()
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._state = "stopped"
+        self._restarts = 0
+        self._launched_at = 0.0
+        self._last_exit_code: Optional[int] = None
+        self._last_restart_reason: Optional[str] = None
+        self._time_to_ready_ms: Optional[float] = None
+        self._initial_time_to_ready_ms: Optional[float] = None
+        self._ready_signal: Optional[str] = None
+
+    # -- public API ---------------------------------------------------------
+
+    def start(self) -> None:
+        """Launch openclaw and start the monitor thread."""
+        self._stopping.clear()
+        self._spawn()
+        self._thread = threading.Thread(target=self._run, name="openclaw-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop monitoring and terminate openclaw."""
+        self._stopping.set()
+        self._wake.set()
+        self._ready.clear()
+        if self._thread is not None:
+            self._thread.join(_TERMINATE_GRACE_SECONDS)
+        self._terminate()
+        with self._lock:
+            self._state = "stopped"
+
+    def wait_ready(self, timeout: float = REQUEST_WAIT_SECONDS) -> bool:
+        """Block until openclaw is ready or *timeout* seconds pass."""
+        return self._ready.wait(timeout)
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def report_failure(self) -> None:
+        """
+        Ask the monitor to check openclaw now (e.g. after a connection error).
+
+        If the process has already exited, readiness is withdrawn immediately
+        so callers go on to wait for the restart rather than retrying a dead
+        port before the monitor notices.
+        """
+        proc = self._proc
+        if proc is None or proc.poll() is not None:
+            self._ready.clear()
+        self._wake.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            proc = self._proc
+            return {
+                "state": self._state,
+                "pid": proc.pid if proc is not None else None,
+                "restarts": self._restarts,
+                "last_exit_code": self._last_exit_code,
+                "last_restart_reason": self._last_restart_reason,
+                "time_to_ready_ms": self._time_to_ready_ms,
+                "initial_time_to_ready_ms": self._initial_time_to_ready_ms,
+                "ready_signal": self._ready_signal,
+            }
+
+    # -- monitor ------------------------------------------------------------
+
+    def _spawn(self) -> None:
+        # A fresh event per launch so output from a previous process's reader
+        # thread cannot mark the new one as ready.
+        hint = threading.Event()
+        self._log_hint = hint
+
+        def on_line(line: str) -> None:
+            if not hint.is_set() and READY_LOG_PATTERN.search(line):
+                hint.set()
+
+        proc = self._launch(on_line=on_line)
+        with self._lock:
+            self._proc = proc
+            self._state = "starting"
+            self._launched_at = time.monotonic()
+
+    def _run(self) -> None:
+        backoff = RESTART_BACKOFF_BASE
+        while not self._stopping.is_set():
+            reason = self._await_ready()
+            if reason is None:
+                reason = self._watch()
+            if reason is None or self._stopping.is_set():
+                return
+
+            self._ready.clear()
+            with self._lock:
+                self._state = "restarting"
+            uptime = time.monotonic() - self._launched_at
+            if uptime >= RESTART_STABLE_SECONDS:
+                backoff = RESTART_BACKOFF_BASE
+            exit_code = self._terminate()
+            self._record_restart(reason, exit_code, backoff)
+            if self._stopping.wait(backoff):
+                return
+            backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+            try:
+                self._spawn()
+            except OSError as e:
+                logger.error("openclaw launch failed error=%s", e)
+                with self._lock:
+                    self._proc = None
+
+    def _await_ready(self) -> Optional[str]:
+        """Probe a freshly launched process until ready; returns a restart reason on failure."""
+        started = self._launched_at
+        hint = self._log_hint
+        interval = READY_PROBE_INITIAL
+        probes = 0
+        while not self._stopping.is_set():
+            proc = self._proc
+            if proc is None or proc.poll() is not None:
+                return "exited"
+            hinted = hint.is_set()
+            probes += 1
+            if self._probe(self._ready_probe):
+                self._mark_ready(proc, started, "log" if hinted else "probe", probes)
+                return None
+            elapsed = time.monotonic() - started
+            if elapsed >= READY_TIMEOUT:
+                return "ready_timeout"
+            if hinted:
+                # Logged as ready but not answering yet: keep probing quickly.
+                interval = READY_PROBE_INITIAL
+                self._stopping.wait(min(interval, READY_TIMEOUT - elapsed))
+            else:
+                hint.wait(min(interval, READY_TIMEOUT - elapsed))
+                interval = min(interval * 2, READY_PROBE_MAX)
+        return None
+
+    def _mark_ready(self, proc: subprocess.Popen, started: float, signal: str, probes: int) -> None:
+        elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+        with self._lock:
+            self._state = "ready"
+            self._time_to_ready_ms = elapsed_ms
+            self._ready_signal = signal
+            initial = self._initial_time_to_ready_ms is None
+            if initial:
+                self._initial_time_to_ready_ms = elapsed_ms
+            restarts = self._restarts
+        self._ready.set()
+        logger.info(
+            "openclaw ready pid=%s time_to_ready_ms=%.1f signal=%s probes=%d",
+            proc.pid, elapsed_ms, signal, probes,
+        )
+        emit_structured({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "log_stream": "agent-container",
+            "event_type": "upstream_ready",
+            "pid": proc.pid,
+            "time_to_ready_ms": elapsed_ms,
+            "ready_signal": signal,
+            "probes": probes,
+            "cold_start": initial,
+            "restarts": restarts,
+        }, with_trace=False)
+
+    def _watch(self) -> Optional[str]:
+        """Monitor a ready process; returns why it must be restarted, or None on stop."""
+        failures = 0
+        while not self._stopping.is_set():
+            woken = self._wake.wait(HEALTH_INTERVAL)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return None
+            proc = self._proc
+            if proc is None or proc.poll() is not None:
+                return "exited"
+            if self._probe(self._liveness_probe):
+                failures = 0
+                continue
+            failures += 1
+            logger.warning(
+                "openclaw health probe failed pid=%s consecutive=%d%s",
+                proc.pid, failures, " (reported by request)" if woken else "",
+            )
+            if failures >= HEALTH_FAILURES:
+                return "unhealthy"
+        return None
+
+    @staticmethod
+    def _probe(probe: Callable[[], bool]) -> bool:
+        try:
+            return bool(probe())
+        except Exception:
+            return False
+
+    def _terminate(self) -> Optional[int]:
+        proc = self._proc
+        if proc is None:
+            return None
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(_TERMINATE_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        return proc.returncode
+
+    def _record_restart(self, reason: str, exit_code: Optional[int], backoff: float) -> None:
+        with self._lock:
+            self._restarts += 1
+            self._last_exit_code = exit_code
+            self._last_restart_reason = reason
+            restarts = self._restarts
+        logger.warning(
+            "Restarting openclaw reason=%s exit_code=%s restarts=%d backoff_s=%.1f",
+            reason, exit_code, restarts, backoff,
+        )
+        emit_structured({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "log_stream": "agent-container",
+            "event_type": "upstream_restart",
+            "reason": reason,
+            "exit_code": exit_code,
+            "restarts": restarts,
+            "backoff_seconds": backoff,
+        }, level=logging.WARNING, with_trace=False)
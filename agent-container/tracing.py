@@ -0,0 +1,144 @@
+"""
+Lightweight trace context for linking one user turn across services.
+
+Uses the W3C ``traceparent`` format (``00-<trace_id>-<span_id>-<flags>``).
+A trace is accepted from the caller of /invocations (or started there),
+forwarded to openclaw in request headers and to the Authorization Agent in
+the PermissionRequest payload, and stamped onto every structured log entry.
+
+Finished spans are appended as JSON lines to TRACE_EXPORT_PATH when set,
+which is enough to rebuild latency waterfalls offline. With no path set,
+spans are still tracked for log correlation but not exported.
+"""
+import contextvars
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORT_PATH = os.environ.get("TRACE_EXPORT_PATH", "")
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class Span:
+    """A timed unit of work within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None,
+                 attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_unix_nano": self.start_ns,
+            "end_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "openclaw_current_span", default=None,
+)
+_export_lock = threading.Lock()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Return ``(trace_id, parent_span_id)`` from a traceparent, or None if invalid."""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, _ = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id
+
+
+def _export(span: Span) -> None:
+    if not TRACE_EXPORT_PATH:
+        return
+    line = json.dumps(span.to_dict(), separators=(",", ":")) + "\n"
+    try:
+        with _export_lock, open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning("Span export failed path=%s error=%s", TRACE_EXPORT_PATH, e)
+
+
+@contextmanager
+def start_span(name: str, traceparent: Optional[str] = None,
+               attributes: Optional[dict] = None) -> Iterator[Span]:
+    """
+    Run the enclosed block in a new span.
+
+    The parent is the remote context in *traceparent* when valid, otherwise
+    the current span; with neither, a new trace is started.
+    """
+    remote = parse_traceparent(traceparent)
+    parent = _current_span.get()
+    if remote is not None:
+        trace_id, parent_span_id = remote
+    elif parent is not None:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_span_id = secrets.token_hex(16), None
+
+    span = Span(name, trace_id, parent_span_id, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set_attribute("error", type(e).__name__)
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        _export(span)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent header value for the current span, or None outside a trace."""
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+def current_ids() -> Dict[str, str]:
+    """``trace_id``/``span_id`` of the current span, for structured log entries."""
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {"trace_id": span.trace_id, "span_id": span.span_id}
@@ -0,0 +1,204 @@
+"""
+Pooled HTTP client for the local openclaw gateway.
+
+Every call to openclaw goes through one shared ``requests.Session`` whose
+adapter keeps a bounded pool of keep-alive connections, so invocations do
+not pay TCP setup and sockets do not pile up in TIME_WAIT under load.
+
+Pool statistics (connection reuse rate and time spent waiting for a free
+connection) are collected in-process and attached to the structured logs.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+OPENCLAW_PORT = 18789
+OPENCLAW_URL = f"http://localhost:{OPENCLAW_PORT}"
+
+# Number of openclaw worker processes; worker i listens on OPENCLAW_PORT + i.
+OPENCLAW_WORKERS = max(1, int(os.environ.get("OPENCLAW_WORKERS", "1")))
+
+# Maximum keep-alive connections held open to each openclaw worker. Callers beyond this
+# block until a connection is returned instead of opening a throwaway socket.
+UPSTREAM_POOL_SIZE = int(os.environ.get("OPENCLAW_POOL_SIZE", "16"))
+
+# Per-call timeouts in seconds: (connect, read)
+CONNECT_TIMEOUT = float(os.environ.get("OPENCLAW_CONNECT_TIMEOUT", "2"))
+READ_TIMEOUT = float(os.environ.get("OPENCLAW_READ_TIMEOUT", "300"))
+PROBE_TIMEOUT = float(os.environ.get("OPENCLAW_PROBE_TIMEOUT", "2"))
+
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,
+    "new_connections": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+}
+
+
+# Per-thread TCP connect time of the most recent post(); 0 when a pooled
+# keep-alive connection was reused.
+_call_timing = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _call_timing.connect_ms = (time.perf_counter() - started) * 1000
+
+
+class _InstrumentedConnectionPool(HTTPConnectionPool):
+    """HTTPConnectionPool that records checkouts, new sockets and wait time."""
+
+    ConnectionCls = _TimedHTTPConnection
+
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        waited_ms = (time.perf_counter() - started) * 1000
+        with _stats_lock:
+            _stats["checkouts"] += 1
+            _stats["wait_ms_total"] += waited_ms
+            if waited_ms > _stats["wait_ms_max"]:
+                _stats["wait_ms_max"] = waited_ms
+        return conn
+
+    def _new_conn(self):
+        with _stats_lock:
+            _stats["new_connections"] += 1
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            **self.poolmanager.pool_classes_by_scheme,
+            "http": _InstrumentedConnectionPool,
+        }
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def worker_url(index: int) -> str:
+    """Base URL of openclaw worker *index*."""
+    return f"http://localhost:{OPENCLAW_PORT + index}"
+
+
+def _new_session(pool_size: int = UPSTREAM_POOL_SIZE) -> requests.Session:
+    session = requests.Session()
+    adapter = _PooledAdapter(
+        pool_connections=OPENCLAW_WORKERS,  # one keep-alive pool per worker port
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide upstream session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session()
+    return _session
+
+
+def post(
+    path: str,
+    json: dict,
+    timeout: Optional[Tuple[float, float]] = None,
+    base_url: str = OPENCLAW_URL,
+    **kwargs,
+) -> requests.Response:
+    """POST *json* to openclaw at *path* over a pooled keep-alive connection."""
+    _call_timing.connect_ms = 0.0
+    return get_session().post(
+        f"{base_url}{path}",
+        json=json,
+        timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT),
+        **kwargs,
+    )
+
+
+def get(
+    path: str,
+    timeout: Optional[Tuple[float, float]] = None,
+    base_url: str = OPENCLAW_URL,
+    **kwargs,
+) -> requests.Response:
+    """GET *path* from openclaw over a pooled keep-alive connection."""
+    return get_session().get(
+        f"{base_url}{path}",
+        timeout=timeout or (CONNECT_TIMEOUT, PROBE_TIMEOUT),
+        **kwargs,
+    )
+
+
+def is_connect_failure(exc: BaseException) -> bool:
+    """
+    True if *exc* means no connection to openclaw could be opened.
+
+    The request was never sent in that case, so it is safe to retry once the
+    upstream is back; errors on an established connection are not.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, NewConnectionError):
+            return True
+        reason = getattr(exc, "reason", None)
+        nested = exc.args[0] if exc.args and isinstance(exc.args[0], BaseException) else None
+        exc = reason if isinstance(reason, BaseException) else nested or exc.__cause__
+    return False
+
+
+def last_connect_ms() -> float:
+    """TCP connect time of this thread's most recent post() (0 if reused)."""
+    return getattr(_call_timing, "connect_ms", 0.0)
+
+
+def pool_stats() -> dict:
+    """Return a snapshot of connection-pool statistics."""
+    with _stats_lock:
+        checkouts = _stats["checkouts"]
+        new_connections = _stats["new_connections"]
+        wait_total = _stats["wait_ms_total"]
+        wait_max = _stats["wait_ms_max"]
+    reused = max(0, checkouts - new_connections)
+    return {
+        "checkouts": checkouts,
+        "new_connections": new_connections,
+        "reuse_rate": round(reused / checkouts, 4) if checkouts else 0.0,
+        "avg_wait_ms": round(wait_total / checkouts, 3) if checkouts else 0.0,
+        "max_wait_ms": round(wait_max, 3),
+    }
+
+
+def close() -> None:
+    """Close all pooled connections (called on shutdown)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
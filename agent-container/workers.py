@@ -0,0 +1,113 @@
+"""
+Pool of openclaw worker processes with tenant-affinity routing.
+
+Each worker is an openclaw process on its own port with its own session
+directory, kept alive by an OpenclawSupervisor. A session key
+(``agentcore:{tenant_id}``) is routed with rendezvous hashing over the
+workers that are currently ready, so a tenant always lands on the same
+worker while it is healthy, and only the tenants of a failed worker move
+elsewhere until it recovers.
+"""
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from supervisor import REQUEST_WAIT_SECONDS, OpenclawSupervisor
+
+logger = logging.getLogger(__name__)
+
+
+class OpenclawWorker:
+    """One openclaw process and its request counters."""
+
+    def __init__(self, index: int, base_url: str, session_dir: str, supervisor: OpenclawSupervisor):
+        self.index = index
+        self.base_url = base_url
+        self.session_dir = session_dir
+        self.supervisor = supervisor
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = 0
+
+    def weight(self, key: bytes) -> bytes:
+        return hashlib.blake2b(key + b"#" + str(self.index).encode(), digest_size=8).digest()
+
+    def stats(self) -> dict:
+        with self._lock:
+            load = {"in_flight": self.in_flight, "requests": self.requests}
+        return {"worker": self.index, "base_url": self.base_url, **load, **self.supervisor.stats()}
+
+
+class WorkerPool:
+    """
+    Routes session keys to openclaw workers.
+
+    *make_supervisor* is called with each worker's index, base URL and
+    session directory and returns the (not yet started) supervisor for it.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        session_dirs: List[str],
+        make_supervisor: Callable[[int, str, str], OpenclawSupervisor],
+    ):
+        self.workers = [
+            OpenclawWorker(i, url, session_dir, make_supervisor(i, url, session_dir))
+            for i, (url, session_dir) in enumerate(zip(urls, session_dirs))
+        ]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.supervisor.start()
+
+    def stop(self) -> None:
+        for worker in self.workers:
+            worker.supervisor.stop()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait until every worker is ready (startup)."""
+        return all(w.supervisor.wait_ready(timeout) for w in self.workers)
+
+    def is_ready(self) -> bool:
+        return any(w.supervisor.is_ready() for w in self.workers)
+
+    def route(self, session_key: str, exclude: Optional[OpenclawWorker] = None) -> OpenclawWorker:
+        """
+        Return the worker for *session_key*.
+
+        The highest rendezvous weight among ready workers wins; if none is
+        ready, the preferred worker over all of them is returned so the
+        caller can wait for its restart.
+        """
+        key = session_key.encode()
+        candidates = [w for w in self.workers if w is not exclude] or self.workers
+        ready = [w for w in candidates if w.supervisor.is_ready()]
+        return max(ready or candidates, key=lambda w: w.weight(key))
+
+    def acquire(self, session_key: str, timeout: float = REQUEST_WAIT_SECONDS,
+                exclude: Optional[OpenclawWorker] = None) -> Optional[OpenclawWorker]:
+        """Route *session_key* and wait up to *timeout* for the chosen worker to be ready."""
+        worker = self.route(session_key, exclude)
+        if worker.supervisor.is_ready():
+            return worker
+        if len(self.workers) > 1:
+            logger.info("No ready openclaw worker for session_key=%s; waiting", session_key)
+        return worker if worker.supervisor.wait_ready(timeout) else None
+
+    @contextmanager
+    def track(self, worker: OpenclawWorker) -> Iterator[OpenclawWorker]:
+        """Count a request against *worker* while the block runs."""
+        with worker._lock:
+            worker.in_flight += 1
+            worker.requests += 1
+        try:
+            yield worker
+        finally:
+            with worker._lock:
+                worker.in_flight -= 1
+
+    def stats(self) -> List[dict]:
+        return [w.stats() for w in self.workers]
@@ -28,10 +28,14 @@ try:
 except ImportError:
     from permission_request import PermissionRequest  # type: ignore[no-redef]
 
+import aws_clients  # noqa: E402
 from identity import issue_approval_token  # noqa: E402
-from permissions import write_permission_profile, read_permission_profile  # noqa: E402
-
-import boto3  # noqa: E402
+from tracing import current_ids, start_span  # noqa: E402
+from permissions import (  # noqa: E402
+    invalidate_permission_profile,
+    read_permission_profile,
+    write_permission_profile,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +47,7 @@ STACK_NAME = os.environ.get("STACK_NAME", "dev")
 # ---------------------------------------------------------------------------
 
 def _ssm_client():
-    return boto3.client("ssm", region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    return aws_clients.get_client("ssm")
 
 
 # ---------------------------------------------------------------------------
@@ -66,6 +70,8 @@ def _log_approval_decision(
         "resource_type": request.resource_type,
         "decision": decision,
         "approver_note": approver_note,
+        "requested_at": request.requested_at.isoformat(),
+        **current_ids(),
     }
     logger.info("APPROVAL_DECISION %s", json.dumps(entry, ensure_ascii=False))
 
@@ -101,7 +107,11 @@ def _update_cedar_policy(tenant_id: str, resource: str, resource_type: str) -> N
     Reads the current Permission_Profile, appends the resource if not already
     present, then writes it back.  The SSM path is:
         /openclaw/{stack}/tenants/{tenant_id}/permissions
+
+    The cached profile is invalidated first so the read-modify-write starts
+    from the current SSM value rather than a possibly stale cache entry.
     """
+    invalidate_permission_profile(tenant_id)
     profile = read_permission_profile(tenant_id)
 
     if resource_type == "tool":
@@ -146,8 +156,22 @@ def execute_approval(
     decision:      One of "approve_temporary", "approve_persistent", "reject".
     approver_note: Optional free-text note from the Human_Approver.
 
+    The decision runs in a span that continues the trace carried by
+    ``request.traceparent``, so it joins the originating invocation's trace.
+
     Requirements: 9.5, 9.6
     """
+    with start_span("auth_agent.execute_approval", traceparent=request.traceparent, attributes={
+        "request_id": request.request_id, "tenant_id": request.tenant_id, "decision": decision,
+    }):
+        _execute_decision(request, decision, approver_note)
+
+
+def _execute_decision(
+    request: PermissionRequest,
+    decision: str,
+    approver_note: Optional[str],
+) -> None:
     if decision == "approve_temporary":
         duration_hours = request.suggested_duration_hours or 1
         effective_ttl = min(duration_hours, 24)  # requirement 9.5 / 5.5
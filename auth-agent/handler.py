@@ -6,17 +6,23 @@ Requirements: 9.3, 9.4, 9.7, 9.9
 
 import logging
 import os
+import sys
 import threading
 from datetime import datetime, timezone
 from typing import Optional
 
-import boto3
+# Shared AWS client registry lives in agent-container
+_agent_container_path = os.path.join(os.path.dirname(__file__), "..", "agent-container")
+if _agent_container_path not in sys.path:
+    sys.path.insert(0, _agent_container_path)
 
 try:
     from .permission_request import PermissionRequest
 except ImportError:
     from permission_request import PermissionRequest  # type: ignore[no-redef]
 
+import aws_clients  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -31,8 +37,8 @@ _DEFAULT_SYSTEM_PROMPT = (
 
 
 def _ssm_client():
-    """Factory for the SSM boto3 client — mockable in tests."""
-    return boto3.client("ssm", region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    """Factory for the SSM boto3 client — mockable in tests; shared via aws_clients."""
+    return aws_clients.get_client("ssm")
 
 
 def load_system_prompt() -> str:
@@ -71,6 +77,11 @@ def get_system_prompt() -> str:
 _pending_requests: dict[str, PermissionRequest] = {}
 _timers: dict[str, threading.Timer] = {}
 
+
+def pending_counts() -> dict:
+    """Return the number of pending requests and armed auto-reject timers."""
+    return {"pending_approvals": len(_pending_requests), "timers": len(_timers)}
+
 # ---------------------------------------------------------------------------
 # Risk assessment
 # ---------------------------------------------------------------------------
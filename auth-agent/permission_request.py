@@ -27,3 +27,4 @@ class PermissionRequest:
     requested_at: datetime
     expires_at: datetime  # 30 minutes after requested_at; auto-reject after this
     status: Literal["pending", "approved", "rejected", "partial", "timeout"]
+    traceparent: Optional[str] = None  # W3C trace context of the originating invocation
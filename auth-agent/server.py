@@ -13,17 +13,32 @@ import sys
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from datetime import datetime, timezone
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(message)s",
-)
 logger = logging.getLogger(__name__)
 
 # Ensure auth-agent modules are importable
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Shared metrics registry lives in agent-container
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "agent-container"))
+
+import startup_profile
+
+startup_profile.install()
 
+import metrics
+from tracing import start_span
 from permission_request import PermissionRequest
-from handler import handle_permission_request, handle_pending_approvals_command
+from handler import handle_permission_request, handle_pending_approvals_command, pending_counts
+
+startup_profile.mark("imports")
+
+metrics.register_callback(
+    "openclaw_pending_approvals", "Permission requests awaiting a Human_Approver decision.",
+    lambda: pending_counts()["pending_approvals"],
+)
+metrics.register_callback(
+    "openclaw_approval_timers", "Armed 30-minute auto-reject timers.",
+    lambda: pending_counts()["timers"],
+)
 
 
 class AuthAgentHandler(BaseHTTPRequestHandler):
@@ -33,6 +48,13 @@ class AuthAgentHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         if self.path == "/ping":
             self._respond(200, {"status": "ok", "role": "auth-agent"})
+        elif self.path == "/metrics":
+            data = metrics.render()
+            self.send_response(200)
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
         else:
             self._respond(404, {"error": "not found"})
 
@@ -55,28 +77,33 @@ class AuthAgentHandler(BaseHTTPRequestHandler):
                 self._respond(200, {"response": result})
                 return
 
-            # Handle PermissionRequest payload
-            try:
-                request = PermissionRequest(
-                    request_id=payload["request_id"],
-                    tenant_id=payload["tenant_id"],
-                    resource_type=payload["resource_type"],
-                    resource=payload["resource"],
-                    reason=payload.get("reason", ""),
-                    duration_type=payload.get("duration_type", "temporary"),
-                    suggested_duration_hours=payload.get("suggested_duration_hours", 1),
-                    requested_at=datetime.fromisoformat(payload["requested_at"]),
-                    expires_at=datetime.fromisoformat(payload["expires_at"]),
-                    status=payload.get("status", "pending"),
-                )
-                result = handle_permission_request(request)
-                self._respond(200, result)
-            except (KeyError, ValueError) as e:
-                logger.error("Invalid PermissionRequest payload: %s", e)
-                self._respond(400, {"error": f"invalid payload: {e}"})
+            # Handle PermissionRequest payload, continuing the sender's trace
+            with start_span("auth_agent.permission_request", traceparent=payload.get("traceparent")):
+                self._handle_permission_request(payload)
         else:
             self._respond(404, {"error": "not found"})
 
+    def _handle_permission_request(self, payload: dict):
+        try:
+            request = PermissionRequest(
+                request_id=payload["request_id"],
+                tenant_id=payload["tenant_id"],
+                resource_type=payload["resource_type"],
+                resource=payload["resource"],
+                reason=payload.get("reason", ""),
+                duration_type=payload.get("duration_type", "temporary"),
+                suggested_duration_hours=payload.get("suggested_duration_hours", 1),
+                requested_at=datetime.fromisoformat(payload["requested_at"]),
+                expires_at=datetime.fromisoformat(payload["expires_at"]),
+                status=payload.get("status", "pending"),
+                traceparent=payload.get("traceparent"),
+            )
+            result = handle_permission_request(request)
+            self._respond(200, result)
+        except (KeyError, ValueError) as e:
+            logger.error("Invalid PermissionRequest payload: %s", e)
+            self._respond(400, {"error": f"invalid payload: {e}"})
+
     def _respond(self, status: int, body: dict):
         data = json.dumps(body, default=str).encode()
         self.send_response(status)
@@ -87,13 +114,19 @@ class AuthAgentHandler(BaseHTTPRequestHandler):
 
 
 def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
     port = int(os.environ.get("PORT", 8080))
-    server = HTTPServer(("0.0.0.0", port), AuthAgentHandler)
+    with startup_profile.phase("http_bind"):
+        server = HTTPServer(("0.0.0.0", port), AuthAgentHandler)
     logger.info(
         "Authorization Agent listening on port %d (session_id=auth-agent-%s)",
         port,
         os.environ.get("STACK_NAME", "dev"),
     )
+    startup_profile.report("auth-agent", logger)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -0,0 +1,140 @@
+"""
+End-to-end tests for memory.compact_tenant_memory() against LocalMemoryClient.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "agent-container"))
+
+import memory  # noqa: E402
+
+TENANT = "tg__123456"
+NAMESPACE = memory._namespace(TENANT)
+
+PIZZA = "User likes pizza with extra cheese and thin crust. Orders from Luigi's on Fridays."
+PIZZA_AGAIN = PIZZA + " Asked for a vegetarian option this time."
+WEATHER = "User asked about the weather in Shenzhen and wants answers in Celsius."
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    local = memory.LocalMemoryClient()
+    monkeypatch.setattr(memory, "MEMORY_BACKEND", "local")
+    monkeypatch.setattr(memory, "_local_client", local)
+    monkeypatch.setattr(memory, "MEMORY_COMPACTION_STATE_PATH", str(tmp_path / "compaction.db"))
+    monkeypatch.setattr(memory, "_compaction_state", None)
+    return local
+
+
+def _store(client, content, timestamp):
+    client.store_memory(
+        memoryId=memory.MEMORY_STORE_ID, namespace=NAMESPACE, content=content,
+        metadata={"tenant_id": TENANT, "timestamp": timestamp},
+    )
+
+
+def _contents(client):
+    response = client.retrieve_memories(memoryId=memory.MEMORY_STORE_ID, namespace=NAMESPACE, maxResults=1000)
+    return [m["content"] for m in response["memories"]]
+
+
+def _new_process(monkeypatch):
+    # A fresh tools/memory_compact.py run: only the state file carries over.
+    monkeypatch.setattr(memory, "_compaction_state", None)
+
+
+def test_merges_near_duplicates_and_reports_bytes_saved(client):
+    _store(client, PIZZA, 1)
+    _store(client, WEATHER, 2)
+    _store(client, PIZZA_AGAIN, 3)
+
+    report = memory.compact_tenant_memory(TENANT)
+
+    assert report["status"] == "compacted"
+    assert (report["summaries_before"], report["summaries_after"], report["merged"]) == (3, 2, 1)
+    assert report["bytes_saved"] == len(PIZZA.encode("utf-8"))
+    assert sorted(_contents(client)) == sorted([WEATHER, PIZZA_AGAIN])
+
+
+def test_dry_run_leaves_namespace_alone(client):
+    _store(client, PIZZA, 1)
+    _store(client, PIZZA_AGAIN, 2)
+
+    report = memory.compact_tenant_memory(TENANT, dry_run=True)
+
+    assert report["status"] == "would_compact"
+    assert report["bytes_saved"] > 0
+    assert _contents(client) == [PIZZA, PIZZA_AGAIN]
+
+
+def test_incremental_across_runs(client, monkeypatch):
+    _store(client, PIZZA, 1)
+    _store(client, WEATHER, 2)
+    assert memory.compact_tenant_memory(TENANT)["status"] == "unchanged"
+
+    _new_process(monkeypatch)
+    report = memory.compact_tenant_memory(TENANT)
+    assert report["status"] == "skipped"
+    assert report["summaries_added_since_last_run"] == 0
+
+    _new_process(monkeypatch)
+    _store(client, PIZZA_AGAIN, 3)
+    report = memory.compact_tenant_memory(TENANT)
+    assert report["status"] == "compacted"
+    assert report["summaries_added_since_last_run"] == 1
+    assert sorted(_contents(client)) == sorted([WEATHER, PIZZA_AGAIN])
+
+
+def test_namespace_larger_than_page_is_not_rewritten(client, monkeypatch):
+    monkeypatch.setattr(memory, "MEMORY_COMPACTION_MAX_RESULTS", 100)
+    distinct = [f"Session {i}: user asked about order {i * 7} and ticket {i * 13}." for i in range(151)]
+    for i, content in enumerate(distinct):
+        _store(client, content, i)
+    _store(client, PIZZA, 200)
+    _store(client, PIZZA_AGAIN, 201)
+
+    for dry_run in (True, False):
+        report = memory.compact_tenant_memory(TENANT, dry_run=dry_run)
+        assert report["status"] == "truncated"
+
+    assert _contents(client) == distinct + [PIZZA, PIZZA_AGAIN]
+
+
+def test_summary_saved_during_rewrite_survives(client, monkeypatch):
+    _store(client, PIZZA, 1)
+    _store(client, PIZZA_AGAIN, 2)
+    late = "User asked for a reminder about the dentist on Monday."
+    delete = client.delete_memory_record
+
+    def delete_while_spool_flushes(**kwargs):
+        _store(client, late, 3)  # e.g. the server's spool flushing mid-rewrite
+        return delete(**kwargs)
+
+    monkeypatch.setattr(client, "delete_memory_record", delete_while_spool_flushes)
+    assert memory.compact_tenant_memory(TENANT)["status"] == "compacted"
+
+    assert late in _contents(client)
+    assert PIZZA_AGAIN in _contents(client)
+    assert PIZZA not in _contents(client)
+
+
+def test_failed_store_keeps_the_originals(client, monkeypatch):
+    older = PIZZA + " Allergic to peanuts."
+    _store(client, older, 1)
+    _store(client, PIZZA_AGAIN, 2)
+    monkeypatch.setattr(memory, "MEMORY_DEDUP_THRESHOLD", 0.5)
+
+    def outage(**kwargs):
+        raise RuntimeError("outage")
+
+    monkeypatch.setattr(client, "store_memory", outage)
+    report = memory.compact_tenant_memory(TENANT)
+
+    assert report["merged"] == 1
+    assert _contents(client) == [older, PIZZA_AGAIN]
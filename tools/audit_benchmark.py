@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the Plan E response audit.
+
+Times the Agent Container's structured audit walk (server._collect_response_tools)
+against the previous approach, a case-insensitive _TOOL_PATTERN scan over the
+json.dumps output, on two synthetic completions: one with many tool calls
+and one text-only. Prints the mean time per audit.
+
+Usage:
+    python tools/audit_benchmark.py [--iterations 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "agent-container"))
+
+import server  # noqa: E402
+
+_PROSE = (
+    "Here is the summary you asked for. The deployment finished, the browser "
+    "session was closed and no shell access was needed for this step. "
+)
+
+
+def _tool_call_completion(calls: int) -> dict:
+    names = ["web_search", "web_fetch", "memory_search", "shell", "file_write"]
+    return {"choices": [{"message": {
+        "role": "assistant",
+        "content": _PROSE * 4,
+        "tool_calls": [
+            {
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": names[i % len(names)], "arguments": json.dumps({"query": _PROSE * 2})},
+                "duration_ms": 12,
+            }
+            for i in range(calls)
+        ],
+    }}]}
+
+
+def _text_completion(repeat: int) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": _PROSE * repeat}}]}
+
+
+def _legacy_audit(result: dict) -> set:
+    return {t.lower() for t in server._TOOL_PATTERN.findall(json.dumps(result))}
+
+
+def _time(fn, result: dict, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(result)
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    cases = {
+        "tool_calls": _tool_call_completion(400),
+        "text_only": _text_completion(600),
+    }
+    for name, result in cases.items():
+        size_kb = len(json.dumps(result)) / 1024
+        legacy = _time(_legacy_audit, result, args.iterations)
+        current = _time(lambda r: server._collect_response_tools(r).audited(), result, args.iterations)
+        print(
+            f"{name:<12} {size_kb:7.0f} KB  regex_over_json={legacy:.2f}ms  "
+            f"structured={current:.2f}ms  speedup={legacy / current:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Offline analytics over exported Agent Container / Authorization Agent logs.
+
+Reads CloudWatch exports (plain text or .gz, one log event per line) and
+summarises the structured entries written by observability.py,
+permissions.py and approval_executor.py:
+
+- ``STRUCTURED_LOG``  agent_invocation      → per-tenant p50/p95/p99 duration, error rate
+- ``STRUCTURED_LOG``/``AUDIT`` permission_denied(_aggregate) → denial hot spots
+- ``APPROVAL_DECISION`` / ``AUTO_REJECT``    → approval turnaround and outcomes
+
+Files are streamed line by line and durations go into fixed log-scale
+histograms (up to 2% relative error), so memory stays constant however
+large the export is. Several files can be processed in parallel with
+``--jobs``; per-file results are merged at the end.
+
+Usage:
+    python tools/log_analytics.py export-*.log.gz [--jobs 4] [--json] [--top 20]
+"""
+import argparse
+import gzip
+import io
+import json
+import math
+import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+# Relative bucket width of the duration histograms.
+HISTOGRAM_GROWTH = 1.02
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+PERCENTILES = (50, 95, 99)
+
+_MARKERS = (b"STRUCTURED_LOG ", b"AUDIT ", b"APPROVAL_DECISION ")
+_AUTO_REJECT = b"AUTO_REJECT "
+_DECODER = json.JSONDecoder()
+_AUTO_REJECT_TENANT = re.compile(rb"tenant_id=(\S+)")
+
+# Bytes read per buffered chunk; large reads matter more than anything else
+# for multi-GB exports.
+_READ_BUFFER = 1 << 20
+
+
+class Histogram:
+    """Log-bucketed histogram of non-negative values with mergeable state."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        index = 0 if value <= 1 else int(math.log(value) / _LOG_GROWTH) + 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = 1.0 if index == 0 else HISTOGRAM_GROWTH ** index
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        result = {"count": self.count}
+        if self.count:
+            result["mean"] = round(self.total / self.count, 1)
+            for pct in PERCENTILES:
+                result[f"p{pct}"] = round(self.percentile(pct), 1)
+            result["max"] = round(self.max, 1)
+        return result
+
+
+class Report:
+    """Aggregates for one or more log files."""
+
+    def __init__(self):
+        self.lines = 0
+        self.parse_errors = 0
+        self.durations: Dict[str, Histogram] = defaultdict(Histogram)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.denials: Counter = Counter()
+        self.turnaround: Dict[str, Histogram] = defaultdict(Histogram)
+        self.decisions: Counter = Counter()
+
+    # -- ingestion ----------------------------------------------------------
+
+    def feed(self, line: bytes) -> None:
+        self.lines += 1
+        for marker in _MARKERS:
+            pos = line.find(marker)
+            if pos >= 0:
+                self._feed_json(line, pos + len(marker))
+                return
+        if _AUTO_REJECT in line:
+            match = _AUTO_REJECT_TENANT.search(line)
+            tenant = match.group(1).decode(errors="replace") if match else "unknown"
+            self.decisions[(tenant, "timeout")] += 1
+
+    def _feed_json(self, line: bytes, start: int) -> None:
+        # raw_decode skips json.loads' encoding detection and tolerates
+        # trailing text (e.g. CloudWatch export suffixes) after the object.
+        try:
+            entry, _ = _DECODER.raw_decode(line[start:].decode("utf-8", "replace"))
+        except ValueError:
+            self.parse_errors += 1
+            return
+        if not isinstance(entry, dict):
+            self.parse_errors += 1
+            return
+        event = entry.get("event_type")
+        tenant = entry.get("tenant_id") or "unknown"
+        if event == "agent_invocation":
+            duration = entry.get("duration_ms")
+            if isinstance(duration, (int, float)):
+                self.durations[tenant].add(duration)
+            self.statuses[tenant][entry.get("status") or "unknown"] += 1
+        elif event == "permission_denied":
+            self.denials[(tenant, entry.get("tool_name") or "unknown")] += 1
+        elif event == "permission_denied_aggregate":
+            # Only the suppressed entries were not already counted one by one.
+            self.denials[(tenant, entry.get("tool_name") or "unknown")] += int(
+                entry.get("suppressed_count") or 0
+            )
+        elif event == "approval_decision":
+            self.decisions[(tenant, entry.get("decision") or "unknown")] += 1
+            seconds = _turnaround_seconds(entry.get("requested_at"), entry.get("timestamp"))
+            if seconds is not None:
+                self.turnaround[tenant].add(seconds)
+
+    # -- merging / output ---------------------------------------------------
+
+    def merge(self, other: "Report") -> None:
+        self.lines += other.lines
+        self.parse_errors += other.parse_errors
+        for tenant, hist in other.durations.items():
+            self.durations[tenant].merge(hist)
+        for tenant, counts in other.statuses.items():
+            self.statuses[tenant].update(counts)
+        self.denials.update(other.denials)
+        for tenant, hist in other.turnaround.items():
+            self.turnaround[tenant].merge(hist)
+        self.decisions.update(other.decisions)
+
+    def to_dict(self, top: int) -> dict:
+        tenants = {}
+        for tenant in sorted(set(self.durations) | set(self.statuses)):
+            statuses = self.statuses.get(tenant, Counter())
+            total = sum(statuses.values())
+            errors = total - statuses.get("success", 0)
+            tenants[tenant] = {
+                "invocations": total,
+                "error_rate": round(errors / total, 4) if total else 0.0,
+                "statuses": dict(statuses),
+                "duration_ms": self.durations[tenant].summary(),
+            }
+        overall_turnaround = Histogram()
+        for hist in self.turnaround.values():
+            overall_turnaround.merge(hist)
+        decisions: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (tenant, decision), count in sorted(self.decisions.items()):
+            decisions[tenant][decision] = count
+        return {
+            "lines": self.lines,
+            "parse_errors": self.parse_errors,
+            "tenants": tenants,
+            "denial_hot_spots": [
+                {"tenant_id": tenant, "tool_name": tool, "count": count}
+                for (tenant, tool), count in self.denials.most_common(top)
+            ],
+            "approvals": {
+                "turnaround_seconds": overall_turnaround.summary(),
+                "turnaround_seconds_by_tenant": {
+                    tenant: hist.summary() for tenant, hist in sorted(self.turnaround.items())
+                },
+                "decisions_by_tenant": dict(decisions),
+            },
+        }
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _turnaround_seconds(requested_at, decided_at) -> Optional[float]:
+    start, end = _parse_time(requested_at), _parse_time(decided_at)
+    if start is None or end is None or (start.tzinfo is None) != (end.tzinfo is None):
+        return None
+    return max(0.0, (end - start).total_seconds())
+
+
+def _open(path: str) -> io.BufferedIOBase:
+    if path == "-":
+        return sys.stdin.buffer
+    if path.endswith(".gz"):
+        return io.BufferedReader(gzip.open(path, "rb"), buffer_size=_READ_BUFFER)
+    return open(path, "rb", buffering=_READ_BUFFER)
+
+
+def analyze_file(path: str) -> Report:
+    """Stream *path* and return its aggregates."""
+    report = Report()
+    stream = _open(path)
+    try:
+        for line in stream:
+            report.feed(line)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    return report
+
+
+def analyze(paths: Iterable[str], jobs: int = 1) -> Report:
+    """Aggregate every file in *paths*, using up to *jobs* worker processes."""
+    paths = list(paths)
+    merged = Report()
+    if jobs > 1 and len(paths) > 1 and "-" not in paths:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for report in pool.map(analyze_file, paths):
+                merged.merge(report)
+    else:
+        for path in paths:
+            merged.merge(analyze_file(path))
+    return merged
+
+
+def _print_text(summary: dict) -> None:
+    print(f"lines={summary['lines']} parse_errors={summary['parse_errors']}")
+    print()
+    print(f"{'tenant':<32} {'calls':>8} {'err%':>6} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9}")
+    for tenant, stats in summary["tenants"].items():
+        d = stats["duration_ms"]
+        print(
+            f"{tenant:<32} {stats['invocations']:>8} {stats['error_rate'] * 100:>6.2f} "
+            f"{d.get('p50', 0):>9.1f} {d.get('p95', 0):>9.1f} {d.get('p99', 0):>9.1f}"
+        )
+    print()
+    print("Denial hot spots:")
+    for spot in summary["denial_hot_spots"]:
+        print(f"  {spot['count']:>8}  {spot['tenant_id']}  {spot['tool_name']}")
+    approvals = summary["approvals"]
+    t = approvals["turnaround_seconds"]
+    print()
+    if t["count"]:
+        print(
+            f"Approval turnaround: n={t['count']} p50={t['p50']}s "
+            f"p95={t['p95']}s p99={t['p99']}s max={t['max']}s"
+        )
+    else:
+        print("Approval turnaround: no decisions with requested_at")
+    for tenant, decisions in approvals["decisions_by_tenant"].items():
+        pairs = " ".join(f"{k}={v}" for k, v in decisions.items())
+        print(f"  {tenant}: {pairs}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", help="exported log files (.gz ok, '-' for stdin)")
+    parser.add_argument("--jobs", type=int, default=1, help="parallel worker processes")
+    parser.add_argument("--top", type=int, default=20, help="denial hot spots to list")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = analyze(args.paths, args.jobs).to_dict(args.top)
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        _print_text(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compact near-duplicate session summaries in tenants' AgentCore Memory namespaces.
+
+Runs memory.compact_tenant_memory() for each tenant and prints one line per
+tenant plus the total bytes saved. Uses the same environment as the Agent
+Container (MEMORY_STORE_ID, AWS_REGION, MEMORY_DEDUP_THRESHOLD, ...).
+Signatures from the previous run are read from MEMORY_COMPACTION_STATE_PATH,
+so only summaries added since are hashed. Merged summaries are stored before
+the records they replace are deleted, so a failed run loses nothing.
+
+Usage:
+    python tools/memory_compact.py TENANT_ID [TENANT_ID ...] [--dry-run] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "agent-container"))
+
+import memory  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("tenant_ids", nargs="+")
+    parser.add_argument("--dry-run", action="store_true", help="report only, do not rewrite")
+    parser.add_argument("--json", action="store_true", help="print the reports as JSON")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    reports = [memory.compact_tenant_memory(tenant_id, dry_run=args.dry_run) for tenant_id in args.tenant_ids]
+
+    saved = sum(r["bytes_saved"] for r in reports if r["status"] in ("compacted", "would_compact"))
+    if args.json:
+        json.dump({"reports": reports, "bytes_saved": saved}, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    for r in reports:
+        print(
+            f"{r['tenant_id']:<24} {r['status']:<13} summaries={r['summaries_before']}->{r['summaries_after']} "
+            f"merged={r['merged']} new={r['summaries_added_since_last_run']} bytes_saved={r['bytes_saved']}"
+        )
+    print(f"total bytes_saved={saved}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Measure entry-point import time in fresh interpreters.
+
+Each run starts a new Python process that imports the Agent Container or
+Authorization Agent ``server`` module and reports how long the import took;
+the median over --runs is printed. Use it before and after changes that
+touch module-level imports or initialisation.
+
+Usage:
+    python tools/startup_benchmark.py [--runs 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "agent-container": os.path.join(REPO_ROOT, "agent-container"),
+    "auth-agent": os.path.join(REPO_ROOT, "auth-agent"),
+}
+
+_SNIPPET = (
+    "import sys, time; t = time.perf_counter(); sys.path.insert(0, {path!r}); "
+    "import server; print((time.perf_counter() - t) * 1000, 'boto3' in sys.modules)"
+)
+
+
+def measure(path: str, runs: int) -> dict:
+    samples = []
+    boto3_loaded = False
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _SNIPPET.format(path=path)],
+            cwd=path, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        samples.append(float(out[0]))
+        boto3_loaded = out[1] == "True"
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "boto3_imported": boto3_loaded,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+    for name, path in ENTRY_POINTS.items():
+        result = measure(path, args.runs)
+        print(
+            f"{name:<16} median={result['median_ms']}ms min={result['min_ms']}ms "
+            f"max={result['max_ms']}ms boto3_imported={result['boto3_imported']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())